@@ -0,0 +1,173 @@
+import numpy as np
+from app.domain.agriPurchase.agri_purchase_catalog import get_catalog, warm_on_load
+from app.domain.agriPurchase.agri_purchase_snapshot import MISSING
+
+GROUP_COLUMNS = {
+    "year": "frcnPcYear",
+    "manufacturer": "mnfcNm",
+}
+
+
+def _empty_ids():
+    return np.empty(0, dtype=np.int64)
+
+
+class PriceAnalytics:
+    """
+    카탈로그 가격 통계 (numpy 배열 기반, 스냅샷마다 1회 계산)
+    - 기종별 가격순 정렬 행 목록 → 분위수/히스토그램은 해당 구간만 사용
+    - (기종, 그룹키, 가격) 순 정렬 → 연도/제조사별 최소/중앙/최대를 한 번에 계산
+    """
+
+    def __init__(self, catalog):
+        columns = catalog.columns
+        self.price = np.asarray(columns.array("price"), dtype=np.int64)
+        self.general_support = np.asarray(columns.array("general_support"), dtype=np.int64)
+        self.coop_support = np.asarray(columns.array("coop_support"), dtype=np.int64)
+        self.name_codes = np.asarray(columns.codes("knmcNm"), dtype=np.int64)
+        self.name_table = columns.table("knmcNm")
+        self._name_lookup = {name: code for code, name in enumerate(self.name_table)}
+
+        # 기종 → 가격순 행 목록 (CSR)
+        self._by_name = np.lexsort((self.price, self.name_codes))
+        self._name_bounds = np.zeros(len(self.name_table) + 1, dtype=np.int64)
+        self._name_bounds[1:] = np.cumsum(np.bincount(self.name_codes, minlength=len(self.name_table)))
+        self._by_price = np.argsort(self.price, kind="stable")
+
+        # 그룹키별: 기종 안에서 (그룹키, 가격) 순 / 전체에서 (그룹키, 가격) 순
+        self._group_codes = {}
+        self._group_tables = {}
+        self._by_name_group = {}
+        self._by_group = {}
+        for key, column in GROUP_COLUMNS.items():
+            codes = np.asarray(columns.codes(column), dtype=np.int64)
+            self._group_codes[key] = codes
+            self._group_tables[key] = columns.table(column)
+            self._by_name_group[key] = np.lexsort((self.price, codes, self.name_codes))
+            self._by_group[key] = np.lexsort((self.price, codes))
+
+    def _name_slice(self, knmcNm):
+        code = self._name_lookup.get(knmcNm)
+        if code is None:
+            return None
+        return slice(self._name_bounds[code], self._name_bounds[code + 1])
+
+    def price_sorted_ids(self, knmcNm=None):
+        """기종(정확히 일치)의 행 번호를 가격 오름차순으로 (None이면 전체)"""
+        if not knmcNm:
+            return self._by_price
+        part = self._name_slice(knmcNm)
+        return _empty_ids() if part is None else self._by_name[part]
+
+    def _group_sorted_ids(self, knmcNm, group_by):
+        if not knmcNm:
+            return self._by_group[group_by]
+        part = self._name_slice(knmcNm)
+        return _empty_ids() if part is None else self._by_name_group[group_by][part]
+
+    def histogram(self, knmcNm=None, bins=20, min_price=None, max_price=None):
+        prices = self.price[self.price_sorted_ids(knmcNm)]
+        if min_price is not None:
+            prices = prices[prices >= min_price]
+        if max_price is not None:
+            prices = prices[prices <= max_price]
+        if not len(prices):
+            return {"count": 0, "edges": [], "counts": []}
+
+        lo = int(prices[0]) if min_price is None else min_price
+        hi = int(prices[-1]) if max_price is None else max_price
+        counts, edges = np.histogram(prices, bins=bins, range=(lo, max(hi, lo + 1)))
+        return {
+            "count": int(len(prices)),
+            "edges": [int(round(e)) for e in edges],
+            "counts": counts.tolist(),
+        }
+
+    def percentiles(self, knmcNm=None, q=(10, 25, 50, 75, 90)):
+        prices = self.price[self.price_sorted_ids(knmcNm)]
+        if not len(prices):
+            return {"count": 0, "min": None, "max": None, "mean": None, "percentiles": {}}
+        values = np.percentile(prices, q)
+        return {
+            "count": int(len(prices)),
+            "min": int(prices[0]),
+            "max": int(prices[-1]),
+            "mean": int(round(prices.mean())),
+            "percentiles": {f"p{p:g}": int(round(v)) for p, v in zip(q, values)},
+        }
+
+    def group_summary(self, knmcNm=None, group_by="year"):
+        """그룹(연도/제조사)별 건수, 최소/중앙/최대 가격"""
+        ids = self._group_sorted_ids(knmcNm, group_by)
+        if not len(ids):
+            return []
+        starts, ends, keys = self._groups(ids, group_by)
+
+        prices = self.price[ids]
+        lower = prices[(starts + ends - 1) // 2]
+        upper = prices[(starts + ends) // 2]
+        table = self._group_tables[group_by]
+        return [
+            {
+                "key": table[key],
+                "count": int(count),
+                "min": int(lo),
+                "median": int(round(med)),
+                "max": int(hi),
+            }
+            for key, count, lo, med, hi in zip(
+                keys.tolist(), (ends - starts).tolist(), prices[starts].tolist(),
+                ((lower + upper) / 2).tolist(), prices[ends - 1].tolist()
+            )
+        ]
+
+    def subsidy(self, knmcNm=None, group_by=None):
+        """일반농가/전업농 지원가를 총 가격 대비 비율로 비교"""
+        if group_by:
+            ids = self._group_sorted_ids(knmcNm, group_by)
+        else:
+            ids = self.price_sorted_ids(knmcNm)
+
+        result = {"overall": self._subsidy_stats(ids)}
+        if group_by and len(ids):
+            starts, ends, keys = self._groups(ids, group_by)
+            table = self._group_tables[group_by]
+            result["groups"] = [
+                dict(key=table[key], **self._subsidy_stats(ids[start:end]))
+                for key, start, end in zip(keys.tolist(), starts.tolist(), ends.tolist())
+            ]
+        return result
+
+    def _groups(self, ids, group_by):
+        """그룹키 순으로 정렬된 ids → 그룹별 (시작, 끝, 키 코드)"""
+        codes = self._group_codes[group_by][ids]
+        boundaries = np.flatnonzero(np.diff(codes)) + 1
+        starts = np.concatenate(([0], boundaries))
+        ends = np.concatenate((boundaries, [len(ids)]))
+        return starts, ends, codes[starts]
+
+    def _subsidy_stats(self, ids):
+        price = self.price[ids]
+        stats = {"count": int(len(ids))}
+        for name, values in (("general", self.general_support[ids]), ("coop", self.coop_support[ids])):
+            valid = (values != MISSING) & (price > 0)
+            ratios = values[valid] / price[valid]
+            stats[name] = {
+                "count": int(valid.sum()),
+                "mean_amount": int(round(values[valid].mean())) if len(ratios) else None,
+                "mean_ratio": round(float(ratios.mean()), 4) if len(ratios) else None,
+                "median_ratio": round(float(np.median(ratios)), 4) if len(ratios) else None,
+            }
+
+        both = (self.general_support[ids] != MISSING) & (self.coop_support[ids] != MISSING)
+        diff = self.coop_support[ids][both] - self.general_support[ids][both]
+        stats["coop_minus_general_mean"] = int(round(diff.mean())) if len(diff) else None
+        return stats
+
+
+warm_on_load("analytics", PriceAnalytics)
+
+
+def get_analytics():
+    """현재 카탈로그 스냅샷의 가격 통계"""
+    return get_catalog().derived("analytics", PriceAnalytics)
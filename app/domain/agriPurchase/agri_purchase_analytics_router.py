@@ -0,0 +1,53 @@
+from fastapi import APIRouter, Query, HTTPException
+from app.domain.agriPurchase.agri_purchase_analytics import get_analytics
+
+router = APIRouter(prefix="/api/agri-purchase/analytics", tags=["AgriPurchase"])
+
+
+def _load():
+    try:
+        return get_analytics()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"데이터 파일 로딩 실패: {str(e)}")
+
+
+@router.get("/histogram")
+def get_price_histogram(
+    knmcNm: str = Query(None, description="기종명 (정확히 일치, 없으면 전체)"),
+    bins: int = Query(20, ge=1, le=200),
+    min_price: int = Query(None),
+    max_price: int = Query(None)
+):
+    return _load().histogram(knmcNm, bins, min_price, max_price)
+
+
+@router.get("/percentiles")
+def get_price_percentiles(
+    knmcNm: str = Query(None, description="기종명 (정확히 일치, 없으면 전체)"),
+    q: str = Query("10,25,50,75,90", description="쉼표로 구분한 분위 (0~100)")
+):
+    try:
+        points = [float(p) for p in q.split(",") if p.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="q는 쉼표로 구분한 숫자여야 합니다.")
+    if not points or any(p < 0 or p > 100 for p in points):
+        raise HTTPException(status_code=400, detail="q는 0~100 사이여야 합니다.")
+    return _load().percentiles(knmcNm, points)
+
+
+@router.get("/summary")
+def get_price_summary(
+    knmcNm: str = Query(None, description="기종명 (정확히 일치, 없으면 전체)"),
+    group_by: str = Query("year", pattern="^(year|manufacturer)$")
+):
+    """연도별/제조사별 최소·중앙·최대 가격"""
+    return {"group_by": group_by, "groups": _load().group_summary(knmcNm, group_by)}
+
+
+@router.get("/subsidy")
+def get_subsidy_comparison(
+    knmcNm: str = Query(None, description="기종명 (정확히 일치, 없으면 전체)"),
+    group_by: str = Query(None, pattern="^(year|manufacturer)$")
+):
+    """일반농가 지원가(gnrlfrmhsSportPc) vs 전업농 지원가(copertnHghltExcfmSportPc), 총 가격 대비 비율"""
+    return _load().subsidy(knmcNm, group_by)
@@ -0,0 +1,248 @@
+import os
+import threading
+import numpy as np
+from app.snapshot import registry
+from app.domain.agriPurchase.agri_purchase_snapshot import (
+    STRING_COLUMNS,
+    SNAPSHOT_FILE,
+    build_columns,
+    file_sha256,
+    load_snapshot,
+)
+
+DATA_FILE = os.path.join(os.path.dirname(__file__), "..", "..", "data", "agri_purchase_full.json")
+
+# 기종명 부분일치 검색용 n-gram 크기
+NGRAM_SIZE = 2
+
+# 정렬 키 → 정렬 기준 컬럼 (가격은 정수, 나머지는 문자열 코드 = 문자열 순서)
+SORT_FIELDS = {
+    "price": "totPc",
+    "year": "frcnPcYear",
+    "manufacturer": "mnfcNm",
+}
+
+
+# 스냅샷이 (재)로딩될 때 미리 만들어 둘 파생 데이터: key → factory(catalog)
+_WARMUPS = {}
+
+
+def warm_on_load(key, factory):
+    """새 카탈로그가 로딩되면 백그라운드에서 derived(key, factory)를 미리 계산"""
+    _WARMUPS[key] = factory
+
+
+def _ngrams(text, n):
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class AgriPurchaseCatalog:
+    """
+    농기계 구입정보 카탈로그 (1회 로딩 후 메모리 인덱스로 검색)
+    - 가격: 정렬된 정수 배열 + bisect(searchsorted) 범위 검색
+    - 연도/제조사: frcnPcYear, mnfcNm 해시 인덱스 (코드별 행 목록)
+    - 기종명: n-gram 역색인 (부분일치)
+    컬럼/인덱스 배열은 JSON에서 만들거나 바이너리 스냅샷을 mmap으로 그대로 사용
+    """
+
+    def __init__(self, columns):
+        self.columns = columns
+        self.prices = columns.array("price")
+
+        self._price_order = columns.array("price_order")
+        self._sorted_prices = columns.array("sorted_price")
+
+        # 값 → 코드 (기종명/연도/제조사는 종류가 적어 dict로 충분)
+        self._codes = {
+            column: {value: code for code, value in enumerate(columns.table(column))}
+            for column in ("knmcNm", "frcnPcYear", "mnfcNm")
+        }
+
+        # n-gram → 기종명 집합 (기종명 종류는 적으므로 이름 단위로 색인)
+        self._name_codes = self._codes["knmcNm"]
+        self._gram_index = {}
+        for name in self._name_codes:
+            for n in range(1, NGRAM_SIZE + 1):
+                for gram in _ngrams(name, n):
+                    self._gram_index.setdefault(gram, set()).add(name)
+
+        # 스냅샷 단위로 한 번만 만드는 파생 데이터 (패싯, 통계 등)
+        self._derived = {}
+        self._derived_lock = threading.Lock()
+
+    @classmethod
+    def from_items(cls, items):
+        return cls(build_columns(items))
+
+    @classmethod
+    def from_snapshot(cls, path=SNAPSHOT_FILE):
+        return cls(load_snapshot(path))
+
+    def __len__(self):
+        return len(self.columns)
+
+    def derived(self, key, factory):
+        """이 카탈로그에서 파생된 객체를 1회만 생성해 보관 (스냅샷이 바뀌면 새 카탈로그에서 다시 생성)"""
+        value = self._derived.get(key)
+        if value is None:
+            with self._derived_lock:
+                value = self._derived.get(key)
+                if value is None:
+                    value = factory(self)
+                    self._derived[key] = value
+        return value
+
+    def warm(self):
+        """등록된 파생 데이터를 백그라운드 스레드에서 미리 생성 (첫 요청이 빌드 비용을 내지 않도록)"""
+        def run():
+            for key, factory in list(_WARMUPS.items()):
+                try:
+                    self.derived(key, factory)
+                except Exception as e:
+                    print(f"⚠️ 카탈로그 파생 데이터 생성 실패 ({key}): {e}")
+
+        threading.Thread(target=run, name="catalog-warmup", daemon=True).start()
+        return self
+
+    def materialize(self, ids):
+        """행 번호 목록 → 응답 dict 목록"""
+        ids = np.asarray(ids, dtype=np.int64)
+        columns = []
+        for field in STRING_COLUMNS:
+            table = self.columns.table(field)
+            values = [table[c] for c in self.columns.codes(field)[ids].tolist()]
+            nulls = self.columns.nulls(field)
+            if nulls is not None:
+                values = [None if null else value for value, null in zip(values, nulls[ids].tolist())]
+            columns.append(values)
+        return [dict(zip(STRING_COLUMNS, values)) for values in zip(*columns)]
+
+    def match_names(self, keyword):
+        """keyword를 포함하는 기종명 집합"""
+        if len(keyword) <= NGRAM_SIZE:
+            return self._gram_index.get(keyword, set())
+
+        candidates = None
+        for gram in _ngrams(keyword, NGRAM_SIZE):
+            names = self._gram_index.get(gram)
+            if not names:
+                return set()
+            candidates = set(names) if candidates is None else candidates & names
+        # n-gram 교집합은 후보일 뿐이므로 실제 포함 여부를 확인
+        return {name for name in candidates if keyword in name}
+
+    def _postings(self, column, code):
+        bounds = self.columns.array(f"bounds:{column}")
+        return self.columns.array(f"order:{column}")[bounds[code]:bounds[code + 1]]
+
+    def _exact_ids(self, column, value):
+        code = self._codes[column].get(value)
+        if code is None:
+            return np.empty(0, dtype=np.int32)
+        return self._postings(column, code)
+
+    def _price_range(self, min_price, max_price):
+        lo = np.searchsorted(self._sorted_prices, min_price, side="left")
+        hi = np.searchsorted(self._sorted_prices, max_price, side="right")
+        return self._price_order[lo:hi]
+
+    def search_ids(self, knmcNm=None, frcnPcYear=None, min_price=0, max_price=999999999, mnfcNm=None):
+        """조건에 맞는 행 번호 배열 (원본 데이터 순서)"""
+        candidates = []
+
+        if knmcNm:
+            codes = [self._name_codes[name] for name in self.match_names(knmcNm)]
+            postings = [self._postings("knmcNm", code) for code in codes]
+            candidates.append(np.concatenate(postings) if postings else np.empty(0, dtype=np.int32))
+        if frcnPcYear:
+            candidates.append(self._exact_ids("frcnPcYear", frcnPcYear))
+        if mnfcNm:
+            candidates.append(self._exact_ids("mnfcNm", mnfcNm))
+
+        if min_price > max_price:
+            return np.empty(0, dtype=np.int64)
+        # 가격 조건이 실제로 범위를 좁힐 때만 bisect 결과를 후보로 사용
+        if len(self._sorted_prices) and (min_price > self._sorted_prices[0] or max_price < self._sorted_prices[-1]):
+            candidates.append(self._price_range(min_price, max_price))
+
+        if not candidates:
+            return np.arange(len(self), dtype=np.int64)
+
+        # 가장 작은 후보 집합부터 교집합
+        candidates.sort(key=len)
+        result = np.sort(candidates[0])
+        for ids in candidates[1:]:
+            if not len(result):
+                break
+            result = result[np.isin(result, ids, assume_unique=True)]
+        return result.astype(np.int64)
+
+    def sort_ids(self, ids, sort):
+        """sort: 'price', 'year', 'manufacturer' (앞에 '-'를 붙이면 내림차순, 같은 값은 원본 순서)"""
+        ids = np.asarray(ids, dtype=np.int64)
+        if not sort:
+            return ids
+        key = sort.lstrip("-")
+        if key not in SORT_FIELDS:
+            raise ValueError(f"지원하지 않는 정렬 키: {sort}")
+
+        values = self.prices[ids] if key == "price" else self.columns.codes(SORT_FIELDS[key])[ids]
+        if sort.startswith("-"):
+            values = -values.astype(np.int64)
+        return ids[np.argsort(values, kind="stable")]
+
+    def search(self, knmcNm=None, frcnPcYear=None, min_price=0, max_price=999999999, mnfcNm=None):
+        return self.materialize(self.search_ids(knmcNm, frcnPcYear, min_price, max_price, mnfcNm))
+
+
+# 바이너리 스냅샷(agri_purchase_catalog.bin)이 원본 JSON과 같으면 mmap으로, 아니면 JSON에서 빌드
+registry.register("agri_purchase_catalog", os.path.basename(SNAPSHOT_FILE),
+                  parse_path=lambda path: AgriPurchaseCatalog.from_snapshot(path).warm())
+registry.register("agri_purchase_full", "agri_purchase_full.json",
+                  build=lambda items: AgriPurchaseCatalog.from_items(items).warm())
+
+# 원본 JSON (stat → sha256), stat이 바뀔 때만 다시 해시
+_source_hash = {"stat": None, "sha256": None}
+_source_lock = threading.Lock()
+_stale_warned = set()
+
+
+def _source_sha256(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    with _source_lock:
+        if _source_hash["stat"] != key:
+            _source_hash["sha256"] = file_sha256(path)
+            _source_hash["stat"] = key
+        return _source_hash["sha256"]
+
+
+def _snapshot_is_current(snapshot):
+    """바이너리 스냅샷이 현재 원본 JSON으로 만든 것인지 (원본이 없으면 스냅샷 사용)"""
+    source_path = registry.path("agri_purchase_full")
+    source = _source_sha256(source_path)
+    if source is None:
+        return True
+    built_from = snapshot.value.columns.header.get("source_sha256")
+    if built_from is not None:
+        return built_from == source
+    # 해시가 없는 이전 형식 스냅샷은 파일 수정 시각으로 비교
+    return snapshot.mtime >= os.path.getmtime(source_path)
+
+
+def get_catalog():
+    """
+    현재 데이터 스냅샷의 카탈로그 반환 (파일이 바뀌면 레지스트리가 새로 빌드)
+    원본 JSON이 바이너리 스냅샷 이후에 바뀌었으면 JSON 쪽을 사용
+    """
+    if registry.exists("agri_purchase_catalog"):
+        snapshot = registry.get("agri_purchase_catalog")
+        if _snapshot_is_current(snapshot):
+            return snapshot.value
+        if snapshot.sha256 not in _stale_warned:
+            _stale_warned.add(snapshot.sha256)
+            print("⚠️ agri_purchase_catalog.bin이 원본 JSON과 달라 JSON에서 카탈로그를 만듭니다. (스냅샷을 다시 생성하세요)")
+    return registry.value("agri_purchase_full")
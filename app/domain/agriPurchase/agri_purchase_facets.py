@@ -0,0 +1,102 @@
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from app.domain.agriPurchase.agri_purchase_catalog import get_catalog, warm_on_load
+
+
+class PurchaseFacets:
+    """
+    카탈로그에서 미리 계산한 패싯 집계표
+    - (기종명, 연도, 제조사) 조합별 정렬된 가격 목록을 보관
+    - 요청 시에는 조합 단위로만 합산하므로 전체 행을 다시 훑지 않음
+    - 각 패싯의 건수는 자기 자신을 제외한 나머지 조건으로 좁혀서 계산
+    """
+
+    def __init__(self, catalog):
+        self.catalog = catalog
+
+        columns = catalog.columns
+        tables = [columns.table(c) for c in ("knmcNm", "frcnPcYear", "mnfcNm")]
+        codes = zip(*(columns.codes(c).tolist() for c in ("knmcNm", "frcnPcYear", "mnfcNm")))
+
+        groups = defaultdict(list)
+        for key, price in zip(codes, catalog.prices.tolist()):
+            groups[key].append(price)
+
+        self.groups = [
+            (tables[0][name], tables[1][year], tables[2][maker], sorted(prices))
+            for (name, year, maker), prices in groups.items()
+        ]
+
+        names = {g[0] for g in self.groups if g[0]}
+        years = {g[1] for g in self.groups if g[1]}
+        self.options = {
+            "machine_names": sorted(names),
+            "years": sorted(years, reverse=True),
+            "min_price": int(catalog.prices.min()) if len(catalog.prices) else 0,
+            "max_price": int(catalog.prices.max()) if len(catalog.prices) else 0,
+        }
+
+    def counts(self, knmcNm=None, frcnPcYear=None, mnfcNm=None, min_price=None, max_price=None):
+        names = self.catalog.match_names(knmcNm) if knmcNm else None
+        price_filtered = min_price is not None or max_price is not None
+        lo_price = min_price if min_price is not None else float("-inf")
+        hi_price = max_price if max_price is not None else float("inf")
+
+        name_counts = defaultdict(int)
+        year_counts = defaultdict(int)
+        maker_counts = defaultdict(int)
+        total = 0
+        matched_min = None
+        matched_max = None
+
+        for name, year, maker, prices in self.groups:
+            if price_filtered:
+                lo = bisect_left(prices, lo_price)
+                hi = bisect_right(prices, hi_price)
+                count = hi - lo
+            else:
+                lo, hi, count = 0, len(prices), len(prices)
+            if not count:
+                continue
+
+            name_ok = names is None or name in names
+            year_ok = not frcnPcYear or year == frcnPcYear
+            maker_ok = not mnfcNm or maker == mnfcNm
+
+            if year_ok and maker_ok:
+                name_counts[name] += count
+            if name_ok and maker_ok:
+                year_counts[year] += count
+            if name_ok and year_ok:
+                maker_counts[maker] += count
+            if name_ok and year_ok and maker_ok:
+                total += count
+                if matched_min is None or prices[lo] < matched_min:
+                    matched_min = prices[lo]
+                if matched_max is None or prices[hi - 1] > matched_max:
+                    matched_max = prices[hi - 1]
+
+        return {
+            "total": total,
+            "price": {"min": matched_min, "max": matched_max},
+            "knmcNm": _facet_list(name_counts),
+            "frcnPcYear": _facet_list(year_counts, by_value_desc=True),
+            "mnfcNm": _facet_list(maker_counts),
+        }
+
+
+def _facet_list(counts, by_value_desc=False):
+    items = [(value, count) for value, count in counts.items() if value]
+    if by_value_desc:
+        items.sort(key=lambda x: x[0], reverse=True)
+    else:
+        items.sort(key=lambda x: (-x[1], x[0]))
+    return [{"value": value, "count": count} for value, count in items]
+
+
+warm_on_load("facets", PurchaseFacets)
+
+
+def get_facets():
+    """현재 카탈로그 스냅샷의 패싯 집계표"""
+    return get_catalog().derived("facets", PurchaseFacets)
@@ -1,61 +1,110 @@
-import os
 import json
+import base64
 from fastapi import APIRouter, Query, HTTPException
+from fastapi.responses import JSONResponse, StreamingResponse
 from typing import List
 from app.domain.agriPurchase.agri_purchase_schema import AgriPurchaseResponse
+from app.domain.agriPurchase.agri_purchase_catalog import get_catalog
+from app.domain.agriPurchase.agri_purchase_similar import get_similar_index, MAX_NEIGHBORS
+from app.snapshot import registry
 
 router = APIRouter(prefix="/api/agri-purchase", tags=["AgriPurchase"])
 
-DATA_FILE = os.path.join(os.path.dirname(__file__), "..", "..", "data", "agri_purchase_full.json")
-DESCRIPTION_FILE = os.path.join(os.path.dirname(__file__), "..", "..", "data", "machine_info.json")
+registry.register("machine_info", "machine_info.json")
+
+# 스트리밍 응답 시 한 번에 내보낼 행 수
+NDJSON_BATCH_SIZE = 500
+
+
+def _encode_cursor(offset, sort):
+    raw = json.dumps({"o": offset, "s": sort or ""}).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def _decode_cursor(cursor, sort):
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        offset = int(data["o"])
+    except Exception:
+        raise HTTPException(status_code=400, detail="잘못된 cursor 값입니다.")
+    if data.get("s", "") != (sort or "") or offset < 0:
+        raise HTTPException(status_code=400, detail="cursor의 정렬 조건이 요청과 다릅니다.")
+    return offset
+
+
+def _iter_ndjson(catalog, ids):
+    """NDJSON_BATCH_SIZE 행씩 만들어 바로 내보냄 (전체 행을 한꺼번에 만들지 않음)"""
+    for start in range(0, len(ids), NDJSON_BATCH_SIZE):
+        batch = catalog.materialize(ids[start:start + NDJSON_BATCH_SIZE])
+        yield "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in batch).encode("utf-8")
+
 
 @router.get("/search", response_model=List[AgriPurchaseResponse])
 def search_from_json(
     knmcNm: str = Query(None),
     frcnPcYear: str = Query(None),
     min_price: int = Query(0),
-    max_price: int = Query(999999999)
+    max_price: int = Query(999999999),
+    mnfcNm: str = Query(None, description="제조사명 (정확히 일치)"),
+    sort: str = Query(None, description="정렬 키 (price, year, manufacturer / 내림차순은 '-price' 처럼 '-' 접두)"),
+    pageNo: int = Query(None, ge=1, description="페이지 번호 (numOfRows와 함께 사용)"),
+    numOfRows: int = Query(None, ge=1, le=1000, description="페이지당 행 수 (없으면 전체 반환)"),
+    cursor: str = Query(None, description="이전 응답의 X-Next-Cursor 값"),
+    format: str = Query("json", pattern="^(json|ndjson)$", description="ndjson: 한 줄에 한 행씩 스트리밍")
 ):
     try:
-        with open(DATA_FILE, "r", encoding="utf-8") as f:
-            all_items = json.load(f)
+        catalog = get_catalog()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"데이터 파일 로딩 실패: {str(e)}")
+
+    try:
+        ids = catalog.sort_ids(catalog.search_ids(knmcNm, frcnPcYear, min_price, max_price, mnfcNm), sort)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    total = len(ids)
+    headers = {"X-Total-Count": str(total)}
+
+    # cursor가 있으면 cursor 기준, 없으면 pageNo 기준 오프셋
+    if cursor:
+        offset = _decode_cursor(cursor, sort)
+    elif numOfRows:
+        offset = ((pageNo or 1) - 1) * numOfRows
+    else:
+        offset = 0
+
+    if numOfRows:
+        ids = ids[offset:offset + numOfRows]
+        if offset + numOfRows < total:
+            headers["X-Next-Cursor"] = _encode_cursor(offset + numOfRows, sort)
+    elif offset:
+        ids = ids[offset:]
+
+    # 행은 컬럼에서 바로 응답 형태로 만들므로 response_model 검증을 건너뜀
+    if format == "ndjson":
+        return StreamingResponse(_iter_ndjson(catalog, ids), media_type="application/x-ndjson", headers=headers)
+    return JSONResponse(content=catalog.materialize(ids), headers=headers)
+
+
+@router.get("/similar/{frcnPcSeqNo}")
+def get_similar_machines(frcnPcSeqNo: str, k: int = Query(10, ge=1, le=MAX_NEIGHBORS)):
+    """같은 기종 안에서 마력·가격·연도·제조사가 비슷한 모델"""
+    try:
+        index = get_similar_index()
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"데이터 파일 로딩 실패: {str(e)}")
 
-    filtered = []
-    for item in all_items:
-        try:
-            totPc_int = int(item.get("totPc", "0").replace(",", ""))
-        except:
-            continue
-
-        if knmcNm and knmcNm not in item.get("knmcNm", ""):
-            continue
-        if frcnPcYear and frcnPcYear != item.get("frcnPcYear", ""):
-            continue
-        if totPc_int < min_price or totPc_int > max_price:
-            continue
-
-        filtered.append({
-            "frcnPcSeqNo": item.get("frcnPcSeqNo"),
-            "knmcNm": item.get("knmcNm"),
-            "fomNm": item.get("fomNm"),
-            "mnfcNm": item.get("mnfcNm"),
-            "frcnPcYear": item.get("frcnPcYear"),
-            "totPc": item.get("totPc"),
-            "gnrlfrmhsSportPc": item.get("gnrlfrmhsSportPc"),
-            "copertnHghltExcfmSportPc": item.get("copertnHghltExcfmSportPc"),
-            "horsepower": item.get("thtmStndrdNclInfo", "") 
-        })
-
-    return filtered
+    result = index.similar(frcnPcSeqNo, k)
+    if result is None:
+        raise HTTPException(status_code=404, detail="해당 농기계 정보를 찾을 수 없습니다.")
+    item, similar = result
+    return {"item": item, "similar": similar}
 
 
 @router.get("/description/{knmcNm}")
 def get_machine_description(knmcNm: str):
     try:
-        with open(DESCRIPTION_FILE, "r", encoding="utf-8") as f:
-            descriptions = json.load(f)
+        descriptions = registry.value("machine_info")
         return descriptions.get(knmcNm, {"description": "설명 정보가 없습니다."})
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"설명 파일 로딩 실패: {str(e)}")
\ No newline at end of file
@@ -0,0 +1,120 @@
+import re
+import numpy as np
+from app.domain.agriPurchase.agri_purchase_catalog import get_catalog, warm_on_load
+
+# 행마다 미리 계산해 두는 이웃 수 (요청 k의 상한)
+MAX_NEIGHBORS = 20
+
+# 특성 가중치 (표준화 후 곱함)
+WEIGHTS = {
+    "horsepower": 1.5,
+    "price": 1.0,
+    "year": 0.5,
+    "manufacturer": 0.7,
+}
+
+_NUMBER = re.compile(r"(\d+(?:\.\d+)?)")
+
+
+def parse_horsepower(text):
+    """'45마력', '35.5PS', '30kW' 등에서 마력 값 추출 (kW는 PS로 환산, 없으면 nan)"""
+    match = _NUMBER.search(text or "")
+    if not match:
+        return np.nan
+    value = float(match.group(1))
+    if "kw" in text.lower():
+        value *= 1.36
+    return value
+
+
+def _standardize(values):
+    filled = values.copy()
+    missing = np.isnan(filled)
+    if missing.all():
+        return np.zeros_like(filled)
+    filled[missing] = np.nanmedian(values)
+    std = filled.std()
+    return (filled - filled.mean()) / std if std > 0 else np.zeros_like(filled)
+
+
+class SimilarMachineIndex:
+    """
+    유사 모델 추천용 최근접 이웃 인덱스 (스냅샷마다 1회 빌드)
+    - 특성: 마력(thtmStndrdNclInfo), log 가격, 연도, 제조사(원-핫)
+    - 기종(knmcNm)이 다르면 비교 대상이 아니므로 기종별로 나눠서 색인
+    - 모든 행의 이웃을 빌드 시점에 미리 구해 두어 요청 시에는 배열 조회만 함
+    """
+
+    def __init__(self, catalog):
+        from sklearn.neighbors import NearestNeighbors
+
+        columns = catalog.columns
+        n = len(catalog)
+        self.catalog = catalog
+
+        seq_table = columns.table("frcnPcSeqNo")
+        self._row_by_seq = {}
+        for row, code in enumerate(columns.codes("frcnPcSeqNo").tolist()):
+            self._row_by_seq.setdefault(seq_table[code], row)
+
+        hp_table = np.array([parse_horsepower(text) for text in columns.table("horsepower")], dtype=np.float64)
+        horsepower = hp_table[columns.codes("horsepower")] if len(hp_table) else np.full(n, np.nan)
+        price = np.log1p(np.maximum(np.asarray(columns.array("price"), dtype=np.float64), 0))
+        year = np.asarray(columns.array("year"), dtype=np.float64)
+        year[year < 0] = np.nan
+
+        numeric = np.column_stack([
+            _standardize(horsepower) * WEIGHTS["horsepower"],
+            _standardize(price) * WEIGHTS["price"],
+            _standardize(year) * WEIGHTS["year"],
+        ])
+        makers = np.asarray(columns.codes("mnfcNm"), dtype=np.int64)
+        names = np.asarray(columns.codes("knmcNm"), dtype=np.int64)
+
+        self.neighbors = np.full((n, MAX_NEIGHBORS), -1, dtype=np.int32)
+        self.distances = np.full((n, MAX_NEIGHBORS), np.inf, dtype=np.float32)
+
+        order = np.argsort(names, kind="stable")
+        bounds = np.flatnonzero(np.diff(names[order])) + 1
+        for group in np.split(order, bounds):
+            if len(group) < 2:
+                continue
+            # 그룹 안에서만 제조사 원-핫 (그룹 밖 제조사는 열을 만들지 않음)
+            group_makers, maker_index = np.unique(makers[group], return_inverse=True)
+            onehot = np.zeros((len(group), len(group_makers)), dtype=np.float64)
+            onehot[np.arange(len(group)), maker_index] = WEIGHTS["manufacturer"]
+            features = np.hstack([numeric[group], onehot])
+
+            k = min(MAX_NEIGHBORS + 1, len(group))
+            model = NearestNeighbors(n_neighbors=k).fit(features)
+            dist, idx = model.kneighbors(features)
+
+            for row_pos, row in enumerate(group):
+                # 자기 자신 제외
+                keep = idx[row_pos] != row_pos
+                found = group[idx[row_pos][keep]][:MAX_NEIGHBORS]
+                self.neighbors[row, :len(found)] = found
+                self.distances[row, :len(found)] = dist[row_pos][keep][:MAX_NEIGHBORS]
+
+    def similar(self, frcnPcSeqNo, k=10):
+        """(기준 행, [(이웃 행 dict, 거리)]) / 없는 번호면 None"""
+        row = self._row_by_seq.get(frcnPcSeqNo)
+        if row is None:
+            return None
+        k = max(1, min(k, MAX_NEIGHBORS))
+        ids = self.neighbors[row, :k]
+        valid = ids >= 0
+        ids = ids[valid]
+        distances = self.distances[row, :k][valid]
+
+        item = self.catalog.materialize([row])[0]
+        rows = self.catalog.materialize(ids)
+        return item, [dict(r, distance=round(float(d), 4)) for r, d in zip(rows, distances.tolist())]
+
+
+warm_on_load("similar", SimilarMachineIndex)
+
+
+def get_similar_index():
+    """현재 카탈로그 스냅샷의 유사 모델 인덱스"""
+    return get_catalog().derived("similar", SimilarMachineIndex)
@@ -0,0 +1,232 @@
+"""
+농기계 구입정보 컬럼형 스냅샷
+- 가격/연도는 정수 배열, 기종명·제조사 등 문자열은 중복 제거한 문자열 테이블 + 행별 코드 배열로 저장
+- 파일(agri_purchase_catalog.bin)은 mmap으로 열기 때문에 여러 uvicorn 워커가 같은 페이지 캐시를 공유
+- JSON에서 바로 만들 때도 같은 구조(CatalogColumns)를 메모리에 만들어 카탈로그 코드는 하나로 유지
+
+파일 구조: MAGIC(8) + 헤더 길이(uint32) + 헤더 JSON + 8바이트 정렬된 배열들
+헤더의 source_sha256: 스냅샷을 만든 원본 JSON의 해시 (원본이 바뀌었는지 확인용)
+"""
+import os
+import json
+import mmap
+import struct
+import hashlib
+import argparse
+import numpy as np
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "data")
+SNAPSHOT_FILE = os.path.join(DATA_DIR, "agri_purchase_catalog.bin")
+
+MAGIC = b"AGPCAT01"
+ALIGN = 8
+
+# 응답 필드 (문자열 테이블로 저장, 원본 문자열 그대로 복원)
+STRING_COLUMNS = (
+    "frcnPcSeqNo",
+    "knmcNm",
+    "fomNm",
+    "mnfcNm",
+    "frcnPcYear",
+    "totPc",
+    "gnrlfrmhsSportPc",
+    "copertnHghltExcfmSportPc",
+    "horsepower",
+)
+
+# 값이 없거나 숫자가 아닌 칸
+MISSING = -1
+
+
+def parse_price(value):
+    """'1,234,000' 형태의 가격 문자열을 정수로 변환 (빈 문자열/null 등 해석할 수 없으면 None)"""
+    try:
+        return int(value.replace(",", ""))
+    except (ValueError, AttributeError):
+        return None
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _parse_int(value):
+    try:
+        return int((value or "").replace(",", ""))
+    except (ValueError, AttributeError):
+        return MISSING
+
+
+class CatalogColumns:
+    """이름 → numpy 배열 묶음 (메모리 또는 mmap)"""
+
+    def __init__(self, arrays, buffer=None, header=None):
+        self.arrays = arrays
+        self.header = header or {}
+        self.n = len(arrays["price"])
+        # mmap 객체 참조 유지 (배열이 이 버퍼를 가리킴)
+        self._buffer = buffer
+        self._tables = {}
+
+    def __len__(self):
+        return self.n
+
+    def array(self, name):
+        return self.arrays[name]
+
+    def codes(self, column):
+        return self.arrays[f"codes:{column}"]
+
+    def nulls(self, column):
+        """원본이 null인 행 표시 (이 배열이 없는 이전 스냅샷이면 None)"""
+        return self.arrays.get(f"nulls:{column}")
+
+    def table(self, column):
+        """문자열 테이블 (코드 → 문자열), 컬럼별로 처음 쓸 때 1회 디코딩"""
+        table = self._tables.get(column)
+        if table is None:
+            offsets = self.arrays[f"offsets:{column}"].tolist()
+            blob = self.arrays[f"blob:{column}"].tobytes()
+            table = [blob[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(len(offsets) - 1)]
+            self._tables[column] = table
+        return table
+
+    def nbytes(self):
+        return sum(a.nbytes for a in self.arrays.values())
+
+
+def _string_table(values):
+    """정렬된 고유 문자열 테이블 → (코드 배열, 오프셋 배열, utf-8 blob)
+    테이블을 정렬해 두므로 코드 순서가 곧 문자열 정렬 순서"""
+    uniques = sorted(set(values))
+    index = {value: i for i, value in enumerate(uniques)}
+    codes = np.fromiter((index[v] for v in values), dtype=np.int32, count=len(values))
+
+    encoded = [value.encode("utf-8") for value in uniques]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    if encoded:
+        offsets[1:] = np.cumsum([len(b) for b in encoded])
+    blob = np.frombuffer(b"".join(encoded), dtype=np.uint8).copy()
+    return codes, offsets, blob
+
+
+def _postings(codes, size):
+    """코드별 행 목록 (CSR): order[bounds[c]:bounds[c + 1]] 이 코드 c의 행 번호들 (오름차순)"""
+    order = np.argsort(codes, kind="stable").astype(np.int32)
+    bounds = np.zeros(size + 1, dtype=np.int64)
+    bounds[1:] = np.cumsum(np.bincount(codes, minlength=size))
+    return order, bounds
+
+
+def build_columns(items):
+    """수집 데이터(dict 목록) → CatalogColumns (가격을 해석할 수 없는 행은 제외, totPc 키가 없으면 0원)"""
+    rows = []
+    prices = []
+    for item in items:
+        price = parse_price(item.get("totPc", "0"))
+        if price is None:
+            continue
+        rows.append(item)
+        prices.append(price)
+
+    arrays = {
+        "price": np.array(prices, dtype=np.int64),
+        "year": np.array([_parse_int(item.get("frcnPcYear")) for item in rows], dtype=np.int32),
+        "general_support": np.array([_parse_int(item.get("gnrlfrmhsSportPc")) for item in rows], dtype=np.int64),
+        "coop_support": np.array([_parse_int(item.get("copertnHghltExcfmSportPc")) for item in rows], dtype=np.int64),
+    }
+
+    for column in STRING_COLUMNS:
+        source = "thtmStndrdNclInfo" if column == "horsepower" else column
+        default = "" if column == "horsepower" else None
+        raw = [item.get(source, default) for item in rows]
+        codes, offsets, blob = _string_table([value or "" for value in raw])
+        arrays[f"codes:{column}"] = codes
+        arrays[f"offsets:{column}"] = offsets
+        arrays[f"blob:{column}"] = blob
+        # 원본이 null인 칸 (응답에서 ""가 아니라 null로 복원)
+        arrays[f"nulls:{column}"] = np.array([value is None for value in raw], dtype=np.uint8)
+
+    # 검색 인덱스도 미리 계산해 파일에 함께 저장
+    order = np.argsort(arrays["price"], kind="stable").astype(np.int32)
+    arrays["price_order"] = order
+    arrays["sorted_price"] = arrays["price"][order]
+    for column in ("knmcNm", "frcnPcYear", "mnfcNm"):
+        size = len(arrays[f"offsets:{column}"]) - 1
+        arrays[f"order:{column}"], arrays[f"bounds:{column}"] = _postings(arrays[f"codes:{column}"], size)
+
+    return CatalogColumns(arrays)
+
+
+def write_snapshot(columns, path=SNAPSHOT_FILE, source_sha256=None):
+    """컬럼 묶음을 단일 바이너리 파일로 저장 (임시 파일에 쓴 뒤 교체)"""
+    layout = {}
+    offset = 0
+    for name, array in columns.arrays.items():
+        array = np.ascontiguousarray(array)
+        layout[name] = {"dtype": array.dtype.str, "offset": offset, "length": int(array.shape[0])}
+        offset += array.nbytes
+        offset += -offset % ALIGN
+
+    header = json.dumps({"rows": columns.n, "source_sha256": source_sha256, "arrays": layout}).encode("utf-8")
+    prefix_size = len(MAGIC) + 4 + len(header)
+    padding = -prefix_size % ALIGN
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(header)))
+        f.write(header)
+        f.write(b"\0" * padding)
+        written = 0
+        for name, array in columns.arrays.items():
+            data = np.ascontiguousarray(array).tobytes()
+            f.write(data)
+            written += len(data)
+            pad = -written % ALIGN
+            f.write(b"\0" * pad)
+            written += pad
+    os.replace(tmp_path, path)
+
+
+def load_snapshot(path=SNAPSHOT_FILE):
+    """바이너리 스냅샷을 mmap으로 열어 CatalogColumns 반환 (배열은 복사 없이 파일을 가리킴)"""
+    with open(path, "rb") as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if buffer[:len(MAGIC)] != MAGIC:
+        buffer.close()
+        raise ValueError(f"카탈로그 스냅샷 형식이 아닙니다: {path}")
+
+    (header_size,) = struct.unpack_from("<I", buffer, len(MAGIC))
+    header_start = len(MAGIC) + 4
+    header = json.loads(bytes(buffer[header_start:header_start + header_size]))
+    base = header_start + header_size
+    base += -base % ALIGN
+
+    arrays = {}
+    for name, spec in header["arrays"].items():
+        arrays[name] = np.frombuffer(buffer, dtype=np.dtype(spec["dtype"]), count=spec["length"], offset=base + spec["offset"])
+    return CatalogColumns(arrays, buffer=buffer, header=header)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="agri_purchase_full.json → 컬럼형 스냅샷 변환")
+    parser.add_argument("--input", default=os.path.join(DATA_DIR, "agri_purchase_full.json"))
+    parser.add_argument("--output", default=SNAPSHOT_FILE)
+    args = parser.parse_args()
+
+    with open(args.input, "r", encoding="utf-8") as f:
+        items = json.load(f)
+    columns = build_columns(items)
+    write_snapshot(columns, args.output, source_sha256=file_sha256(args.input))
+    print(f"✅ 스냅샷 저장 완료: {os.path.abspath(args.output)} ({columns.n}건, {os.path.getsize(args.output) / 1024:.0f} KB)")
+
+
+if __name__ == "__main__":
+    main()
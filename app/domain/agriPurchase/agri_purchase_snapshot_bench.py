@@ -0,0 +1,75 @@
+"""
+카탈로그 로딩 벤치마크: JSON(agri_purchase_full.json) vs 컬럼형 스냅샷(agri_purchase_catalog.bin)
+각 방식을 별도 프로세스에서 실행해 로딩 시간과 메모리(RSS)를 비교
+- RssAnon: 워커마다 따로 잡히는 메모리
+- RssFile: mmap된 파일 페이지 (같은 파일을 여는 워커끼리 페이지 캐시 공유)
+실행: python -m app.domain.agriPurchase.agri_purchase_snapshot_bench
+"""
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+from app.domain.agriPurchase.agri_purchase_catalog import DATA_FILE
+from app.domain.agriPurchase.agri_purchase_snapshot import SNAPSHOT_FILE
+
+CHILD = """
+import sys, time, json
+from app.domain.agriPurchase.agri_purchase_catalog import AgriPurchaseCatalog
+
+def status():
+    result = {}
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                if key in ("VmRSS", "RssAnon", "RssFile"):
+                    result[key] = int(value.split()[0]) / 1024
+    except FileNotFoundError:
+        pass
+    return result
+
+mode, path = sys.argv[1], sys.argv[2]
+before = status()
+started = time.perf_counter()
+if mode == "json":
+    with open(path, "r", encoding="utf-8") as f:
+        catalog = AgriPurchaseCatalog.from_items(json.load(f))
+else:
+    catalog = AgriPurchaseCatalog.from_snapshot(path)
+load_ms = (time.perf_counter() - started) * 1000
+catalog.search("트랙터")
+after = status()
+print(json.dumps({"rows": len(catalog), "load_ms": load_ms, "before": before, "after": after}))
+"""
+
+
+def run(mode, path):
+    env = dict(os.environ, PYTHONPATH=os.getcwd())
+    output = subprocess.check_output([sys.executable, "-c", CHILD, mode, path], env=env, text=True)
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--json", default=DATA_FILE)
+    parser.add_argument("--snapshot", default=SNAPSHOT_FILE)
+    args = parser.parse_args()
+
+    for mode, path in (("json", args.json), ("snapshot", args.snapshot)):
+        if not os.path.exists(path):
+            print(f"{mode:8s} 파일 없음: {path}")
+            continue
+        result = run(mode, path)
+        before, after = result["before"], result["after"]
+        delta = {key: after.get(key, 0) - before.get(key, 0) for key in ("VmRSS", "RssAnon", "RssFile")}
+        print(
+            f"{mode:8s} {os.path.getsize(path) / 1024 / 1024:6.1f} MB  {result['rows']}건  "
+            f"로딩 {result['load_ms']:7.1f} ms  "
+            f"RSS +{delta['VmRSS']:6.1f} MB (anon +{delta['RssAnon']:6.1f} / file +{delta['RssFile']:6.1f})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,25 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from fastapi.responses import JSONResponse
-import os
-import json
+from app.domain.agriPurchase.agri_purchase_facets import get_facets
 
 router = APIRouter()
 
 @router.get("/api/agri-purchase/options")
-async def get_dropdown_options():
+async def get_dropdown_options(
+    knmcNm: str = Query(None),
+    frcnPcYear: str = Query(None),
+    mnfcNm: str = Query(None),
+    min_price: int = Query(None),
+    max_price: int = Query(None)
+):
+    """
+    드롭다운 옵션 + 패싯 건수 (agri_purchase_full.json 카탈로그에서 계산)
+    - 필터를 주면 각 패싯 건수가 나머지 조건으로 좁혀짐
+    """
     try:
-        file_path = os.path.join(os.path.dirname(__file__), "..", "..", "data", "agri_purchase_options.json")
-
-        with open(file_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
+        facets = get_facets()
+        data = dict(facets.options)
+        data["facets"] = facets.counts(knmcNm, frcnPcYear, mnfcNm, min_price, max_price)
         return JSONResponse(content=data)
 
     except Exception as e:
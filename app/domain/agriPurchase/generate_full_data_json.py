@@ -1,58 +1,195 @@
 import os
-import requests
-import xml.etree.ElementTree as ET
+import sys
 import json
-import html
+import math
+import shutil
+import asyncio
+import argparse
+import xml.etree.ElementTree as ET
+import httpx
+from tenacity import AsyncRetrying, stop_after_attempt, wait_exponential, retry_if_exception_type
 from dotenv import load_dotenv
 
+from app.nongsaro.xml_parser import parse_items
+from app.domain.agriPurchase.generate_options_json import write_options, OUTPUT_PATH as OPTIONS_PATH
+from app.domain.agriPurchase.agri_purchase_snapshot import build_columns, file_sha256, write_snapshot, SNAPSHOT_FILE
+
 load_dotenv()
 API_KEY = os.getenv("AGRI_PURCHASE_API_KEY")
-BASE_URL = "http://api.nongsaro.go.kr/service/farmMachineDecision/selectAgriPriceInfoLst"
+BASE_URL = os.getenv("AGRI_PURCHASE_API_URL", "http://api.nongsaro.go.kr/service/farmMachineDecision/selectAgriPriceInfoLst")
 
 OUTPUT_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "data", "agri_purchase_full.json")
+# 페이지별 중간 저장 위치 (중단 후 재실행 시 이어받기)
+CHECKPOINT_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "data", ".crawl", "agri_purchase")
 
-def fetch_all_data():
-    page_no = 1
-    total_count = 0
-    all_items = []
+NUM_OF_ROWS = 100
+CONCURRENCY = 8
+MAX_ATTEMPTS = 5
 
-    print("🚜 농기계 전체 데이터 수집 시작...")
 
-    while True:
+class CrawlError(Exception):
+    pass
+
+
+def parse_page(content):
+    """응답 XML → (totalCount, 항목 목록)"""
+    meta = {}
+    try:
+        items = parse_items(content, unescape=True, meta=meta)
+    except ET.ParseError as e:
+        raise CrawlError(f"XML 파싱 실패: {e}")
+    return meta.get("totalCount"), items
+
+
+class AgriPurchaseCrawler:
+    """
+    농기계 구입정보 비동기 수집기
+    - 1페이지로 totalCount 확인 후 나머지 페이지를 동시에 요청 (동시 요청 수 제한)
+    - 실패 시 지수 백오프 재시도
+    - 완료된 페이지는 체크포인트로 저장해 중단 후 이어받기
+    """
+
+    def __init__(self, base_url=BASE_URL, api_key=API_KEY, concurrency=CONCURRENCY,
+                 checkpoint_dir=CHECKPOINT_DIR, num_of_rows=NUM_OF_ROWS, max_attempts=MAX_ATTEMPTS,
+                 backoff=0.5, transport=None):
+        """backoff: 재시도 대기 배수(초), transport: httpx 전송 계층 교체용 (테스트)"""
+        self.base_url = base_url
+        self.api_key = api_key
+        self.concurrency = concurrency
+        self.checkpoint_dir = checkpoint_dir
+        self.num_of_rows = num_of_rows
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.transport = transport
+
+    def _page_path(self, page_no):
+        return os.path.join(self.checkpoint_dir, f"page_{page_no:05d}.json")
+
+    def _load_meta(self):
+        try:
+            with open(os.path.join(self.checkpoint_dir, "meta.json"), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _prepare_checkpoint(self, total_count):
+        """totalCount나 페이지 크기가 이전 실행과 다르면 체크포인트를 버리고 새로 시작"""
+        meta = {"totalCount": total_count, "numOfRows": self.num_of_rows, "baseUrl": self.base_url}
+        if self._load_meta() != meta:
+            shutil.rmtree(self.checkpoint_dir, ignore_errors=True)
+            os.makedirs(self.checkpoint_dir, exist_ok=True)
+            _write_json_atomic(os.path.join(self.checkpoint_dir, "meta.json"), meta)
+
+    def _save_page(self, page_no, items):
+        _write_json_atomic(self._page_path(page_no), items)
+
+    def _load_page(self, page_no):
+        try:
+            with open(self._page_path(page_no), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    async def _fetch_page(self, client, page_no):
         params = {
-            "apiKey": API_KEY,
+            "apiKey": self.api_key,
             "pageNo": page_no,
-            "numOfRows": 100
+            "numOfRows": self.num_of_rows
         }
+        async for attempt in AsyncRetrying(
+            stop=stop_after_attempt(self.max_attempts),
+            wait=wait_exponential(multiplier=self.backoff, max=10),
+            retry=retry_if_exception_type((httpx.HTTPError, CrawlError)),
+            reraise=True,
+        ):
+            with attempt:
+                response = await client.get(self.base_url, params=params)
+                response.raise_for_status()
+                return parse_page(response.content)
+
+    async def crawl(self):
+        limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+        timeout = httpx.Timeout(10.0, connect=5.0)
+        async with httpx.AsyncClient(limits=limits, timeout=timeout, transport=self.transport) as client:
+            total_count, first_items = await self._fetch_page(client, 1)
+            if total_count is None:
+                raise CrawlError("totalCount를 찾을 수 없습니다.")
+
+            total_pages = max(1, math.ceil(total_count / self.num_of_rows))
+            self._prepare_checkpoint(total_count)
+            self._save_page(1, first_items)
+
+            pending = [p for p in range(2, total_pages + 1) if self._load_page(p) is None]
+            done = total_pages - len(pending)
+            print(f"🚜 총 {total_count}건 / {total_pages}페이지 (이어받기 {done - 1}페이지, 남은 {len(pending)}페이지)")
+
+            semaphore = asyncio.Semaphore(self.concurrency)
+
+            async def run(page_no):
+                nonlocal done
+                async with semaphore:
+                    _, items = await self._fetch_page(client, page_no)
+                self._save_page(page_no, items)
+                done += 1
+                print(f"📄 {done}/{total_pages} 페이지 처리 완료")
 
-        response = requests.get(BASE_URL, params=params, timeout=10)
-        root = ET.fromstring(response.content)
+            # 일부 페이지가 실패해도 나머지는 끝까지 받아 체크포인트로 남김
+            results = await asyncio.gather(*(run(p) for p in pending), return_exceptions=True)
+            errors = [r for r in results if isinstance(r, Exception)]
+            if errors:
+                raise CrawlError(f"{len(errors)}개 페이지 수집 실패 (재실행 시 이어받기): {errors[0]}")
 
-        if total_count == 0:
-            total_tag = root.find(".//totalCount")
-            if total_tag is not None and total_tag.text.isdigit():
-                total_count = int(total_tag.text)
-            else:
-                break
+        all_items = []
+        for page_no in range(1, total_pages + 1):
+            items = self._load_page(page_no)
+            if items is None:
+                raise CrawlError(f"{page_no}페이지 체크포인트가 없습니다.")
+            all_items.extend(items)
+        return all_items
 
-        items = root.find(".//items")
-        if items is None or not list(items):
-            break
+    def clear_checkpoint(self):
+        shutil.rmtree(self.checkpoint_dir, ignore_errors=True)
+
+
+def _write_json_atomic(path, data, indent=None):
+    """임시 파일에 쓴 뒤 교체 (서버가 쓰는 도중의 파일을 읽지 않도록)"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=indent)
+    os.replace(tmp_path, path)
+
+
+async def fetch_all_data_async(concurrency=CONCURRENCY, fresh=False, output_path=OUTPUT_PATH,
+                               options_path=OPTIONS_PATH, snapshot_path=SNAPSHOT_FILE):
+    crawler = AgriPurchaseCrawler(concurrency=concurrency)
+    if fresh:
+        crawler.clear_checkpoint()
+
+    print("🚜 농기계 전체 데이터 수집 시작...")
+    all_items = await crawler.crawl()
 
-        for item in items.findall("item"):
-            record = {child.tag: (html.unescape(child.text.strip()) if child.text else "") for child in item}
-            all_items.append(record)
+    # 전체 데이터, 옵션 파일, 서버용 컬럼형 스냅샷을 한 번의 수집으로 함께 생성
+    _write_json_atomic(output_path, all_items, indent=2)
+    print(f"✅ 전체 JSON 저장 완료: {os.path.abspath(output_path)} ({len(all_items)}건)")
+    write_options(all_items, options_path)
+    write_snapshot(build_columns(all_items), snapshot_path, source_sha256=file_sha256(output_path))
+    print(f"✅ 카탈로그 스냅샷 저장 완료: {os.path.abspath(snapshot_path)}")
 
-        print(f"📄 {page_no * 100}/{total_count} 항목 처리 중...")
-        page_no += 1
-        if page_no * 100 > total_count:
-            break
+    crawler.clear_checkpoint()
+    return all_items
 
-    os.makedirs(os.path.dirname(OUTPUT_PATH), exist_ok=True)
-    with open(OUTPUT_PATH, "w", encoding="utf-8") as f:
-        json.dump(all_items, f, ensure_ascii=False, indent=2)
 
-    print(f"✅ 전체 JSON 저장 완료: {os.path.abspath(OUTPUT_PATH)}")
+def fetch_all_data(concurrency=CONCURRENCY, fresh=False):
+    return asyncio.run(fetch_all_data_async(concurrency=concurrency, fresh=fresh))
 
 if __name__ == "__main__":
-    fetch_all_data()
+    parser = argparse.ArgumentParser(description="농기계 구입정보 전체 수집")
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY, help="동시 요청 수")
+    parser.add_argument("--fresh", action="store_true", help="체크포인트를 무시하고 처음부터 수집")
+    args = parser.parse_args()
+    try:
+        fetch_all_data(concurrency=args.concurrency, fresh=args.fresh)
+    except CrawlError as e:
+        print(f"❌ 수집 실패: {e}")
+        sys.exit(1)
@@ -1,56 +1,125 @@
-import requests
-import xml.etree.ElementTree as ET
-from fastapi import APIRouter
+import json
+import asyncio
+from typing import List
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
 import os
 from dotenv import load_dotenv
+from app.nongsaro.http_client import upstream_errors
+from app.nongsaro.cache import cached_get
+from app.nongsaro.fanout import fan_out, iter_fan_out, FANOUT_CONCURRENCY
+from app.nongsaro.xml_parser import parse_items, first_item
+from app.domain.agriSafety.safety_mirror import mirror
 
 load_dotenv()
 router = APIRouter()
 API_KEY = os.getenv("NONGSARO_API_KEY")
 
 @router.get("/api/agri-accident/list")
-def get_agri_accident_list(page: int = 1, rows: int = 100):
+async def get_agri_accident_list(page: int = 1, rows: int = 100, knmcCodeNm: str = None, safeAcdntSeCodeNm: str = None):
+    # 로컬 미러가 동기화돼 있으면 업스트림 호출 없이 조회
+    if await asyncio.to_thread(mirror.is_synced, "accident_case"):
+        total, items = await asyncio.to_thread(
+            mirror.list, "accident_case", page, rows,
+            knmcCodeNm=knmcCodeNm, safeAcdntSeCodeNm=safeAcdntSeCodeNm,
+        )
+        return {"items": items, "totalCount": total}
+
     url = "http://api.nongsaro.go.kr/service/agriAccident/agriAccidentLst"
     params = {
         "apiKey": API_KEY,
         "pageNo": page,
         "numOfRows": rows,
     }
-    response = requests.get(url, params=params)
-
-    try:
-        root = ET.fromstring(response.text)
-        items = []
-        for item_elem in root.findall(".//item"):
-            item = {
-                child.tag: child.text.strip() if child.text else ""
-                for child in item_elem
-            }
-            items.append(item)
-        return {"items": items}
-    except Exception as e:
-        return {"error": str(e), "raw": response.text}
+    with upstream_errors():
+        items = await cached_get("agri_accident_list", url, params, parse_items)
+    # 미러가 준비되기 전에는 받아온 페이지 안에서만 필터
+    items = [
+        item for item in items
+        if (not knmcCodeNm or item.get("knmcCodeNm") == knmcCodeNm)
+        and (not safeAcdntSeCodeNm or item.get("safeAcdntSeCodeNm") == safeAcdntSeCodeNm)
+    ]
+    return {"items": items}
 
-# 사고사례 상세
-@router.get("/api/agri-accident/detail/{cntntsNo}")
-def get_agri_accident_detail(cntntsNo: str):
-    url = "http://api.nongsaro.go.kr/service/agriAccident/agriAccidentDtl"
+
+@router.get("/api/agri-accident/filters")
+async def get_agri_accident_filters():
+    """기종/사고유형별 건수 (미러 기준)"""
+    return {
+        "knmcCodeNm": await asyncio.to_thread(mirror.values, "accident_case", "knmcCodeNm"),
+        "safeAcdntSeCodeNm": await asyncio.to_thread(mirror.values, "accident_case", "safeAcdntSeCodeNm"),
+    }
+
+DETAIL_URL = "http://api.nongsaro.go.kr/service/agriAccident/agriAccidentDtl"
+
+# 일괄 상세 조회 한 번에 받을 수 있는 최대 건수
+MAX_BATCH = 100
+
+
+class AccidentDetailBatchRequest(BaseModel):
+    cntntsNo: List[str]
+
+
+async def _fetch_detail(cntntsNo):
+    """업스트림 상세 조회 (응답 캐시 경유), 받아온 상세는 미러에도 저장"""
     params = {
         "apiKey": API_KEY,
         "cntntsNo": cntntsNo,
     }
-    response = requests.get(url, params=params)
-
-    try:
-        root = ET.fromstring(response.text)
-        item_elem = root.find(".//item")
-        if item_elem is None:
-            return {"error": "No data found", "raw": response.text}
-
-        item = {
-            child.tag: child.text.strip() if child.text else ""
-            for child in item_elem
-        }
+    item = await cached_get("agri_accident_detail", DETAIL_URL, params, first_item)
+    if item is not None:
+        await asyncio.to_thread(mirror.save_accident_detail, cntntsNo, item)
+    return item
+
+
+def _batch_entry(cntntsNo, result):
+    if isinstance(result, Exception):
+        return {"cntntsNo": cntntsNo, "error": f"상세 조회 실패: {type(result).__name__}"}
+    if result is None:
+        return {"cntntsNo": cntntsNo, "error": "No data found"}
+    return {"cntntsNo": cntntsNo, "item": result}
+
+
+# 사고사례 상세
+@router.get("/api/agri-accident/detail/{cntntsNo}")
+async def get_agri_accident_detail(cntntsNo: str):
+    item = await asyncio.to_thread(mirror.accident_detail, cntntsNo)
+    if item is not None:
         return {"item": item}
-    except Exception as e:
-        return {"error": str(e), "raw": response.text}
+
+    with upstream_errors():
+        item = await _fetch_detail(cntntsNo)
+
+    if item is None:
+        return {"error": "No data found"}
+    return {"item": item}
+
+
+# 사고사례 상세 일괄 조회
+@router.post("/api/agri-accident/details")
+async def get_agri_accident_details(
+    request: AccidentDetailBatchRequest,
+    stream: bool = Query(False, description="true면 끝나는 순서대로 한 줄씩(NDJSON) 전송"),
+    concurrency: int = Query(FANOUT_CONCURRENCY, ge=1, le=20, description="업스트림 동시 요청 수"),
+):
+    """미러에 있는 건은 바로, 없는 건만 업스트림에 동시 요청 (요청 순서대로 응답, stream이면 완료 순)"""
+    keys = list(dict.fromkeys(k for k in request.cntntsNo if k))
+    if len(keys) > MAX_BATCH:
+        raise HTTPException(status_code=400, detail=f"한 번에 최대 {MAX_BATCH}건까지 조회할 수 있습니다.")
+
+    local = await asyncio.to_thread(mirror.accident_details, keys)
+    missing = [k for k in keys if k not in local]
+
+    if stream:
+        async def iter_ndjson():
+            for cntntsNo, item in local.items():
+                yield json.dumps(_batch_entry(cntntsNo, item), ensure_ascii=False) + "\n"
+            async for cntntsNo, result in iter_fan_out(missing, _fetch_detail, concurrency):
+                yield json.dumps(_batch_entry(cntntsNo, result), ensure_ascii=False) + "\n"
+
+        return StreamingResponse(iter_ndjson(), media_type="application/x-ndjson")
+
+    fetched = await fan_out(missing, _fetch_detail, concurrency)
+    results = {**local, **fetched}
+    return {"items": [_batch_entry(k, results[k]) for k in keys]}
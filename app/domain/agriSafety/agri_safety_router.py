@@ -1,32 +1,73 @@
-import requests
-import xml.etree.ElementTree as ET
-from fastapi import APIRouter
+import asyncio
+from fastapi import APIRouter, Query, Depends
 import os
 from dotenv import load_dotenv
+from app.nongsaro.http_client import upstream_errors
+from app.nongsaro.cache import cache, cached_get
+from app.nongsaro.paging import fetch_all_pages
+from app.nongsaro.xml_parser import parse_items
+from app.domain.agriSafety.safety_mirror import mirror
+from app.domain.user.user_router import get_current_user
 
 load_dotenv()
 router = APIRouter()
 API_KEY = os.getenv("NONGSARO_API_KEY")
 
+GUIDE_URL = "http://api.nongsaro.go.kr/service/machineSafety/machineSafetyLst"
+
+
+def _filter_guides(items, knmcNm=None, safeacdntSeNm=None):
+    return [
+        item for item in items
+        if (not knmcNm or item.get("knmcNm") == knmcNm)
+        and (not safeacdntSeNm or item.get("safeacdntSeNm") == safeacdntSeNm)
+    ]
+
+
 @router.get("/api/agri-safety/safety-guide")
-def get_safety_guide_list(page: int = 1, rows: int = 100):  
-    url = "http://api.nongsaro.go.kr/service/machineSafety/machineSafetyLst"
+async def get_safety_guide_list(
+    page: int = 1,
+    rows: int = 100,
+    knmcNm: str = None,
+    safeacdntSeNm: str = None,
+    all_pages: bool = Query(False, alias="all", description="true면 전체 페이지를 합쳐서 반환 (page/rows 무시)"),
+):
+    if await asyncio.to_thread(mirror.is_synced, "safety_guide"):
+        total, items = await asyncio.to_thread(
+            mirror.list, "safety_guide", page, None if all_pages else rows,
+            knmcNm=knmcNm, safeacdntSeNm=safeacdntSeNm,
+        )
+        return {"items": items, "totalCount": total}
+
+    if all_pages:
+        # 전체 페이지를 동시에 받아 합친 목록을 캐시해 두고 필터만 매번 적용
+        with upstream_errors():
+            items = await cache.get(
+                "agri_safety_guide_all", {},
+                lambda: fetch_all_pages(GUIDE_URL, {"apiKey": API_KEY}),
+            )
+        items = _filter_guides(items, knmcNm, safeacdntSeNm)
+        return {"items": items, "totalCount": len(items)}
+
+    url = GUIDE_URL
     params = {
         "apiKey": API_KEY,
         "pageNo": page,
         "numOfRows": rows,
     }
-    response = requests.get(url, params=params)
-
-    try:
-        root = ET.fromstring(response.text)
-        items = []
-        for item_elem in root.findall(".//item"):
-            item = {
-                child.tag: child.text.strip() if child.text else ""
-                for child in item_elem
-            }
-            items.append(item)
-        return {"items": items}
-    except Exception as e:
-        return {"error": str(e), "raw": response.text}
+    with upstream_errors():
+        items = await cached_get("agri_safety_guide", url, params, parse_items)
+    return {"items": _filter_guides(items, knmcNm, safeacdntSeNm)}
+
+
+@router.get("/api/agri-safety/mirror")
+async def get_mirror_status():
+    """안전지침/사고사례 로컬 미러 동기화 상태"""
+    return {"tables": await asyncio.to_thread(mirror.status)}
+
+
+@router.post("/api/agri-safety/mirror/sync")
+async def sync_mirror(current_user=Depends(get_current_user)):
+    """즉시 동기화 (끝날 때까지 대기)"""
+    await mirror.sync()
+    return {"tables": await asyncio.to_thread(mirror.status)}
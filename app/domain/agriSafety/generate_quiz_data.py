@@ -1,9 +1,13 @@
 import os
 import json
+import asyncio
 import requests
-import xml.etree.ElementTree as ET
 from dotenv import load_dotenv
 from tqdm import tqdm
+from app.nongsaro.xml_parser import parse_items, first_item
+from app.nongsaro.http_client import nongsaro_get, close_client
+from app.nongsaro.fanout import iter_fan_out, FANOUT_CONCURRENCY
+from app.nongsaro.paging import fetch_all_pages
 
 load_dotenv()
 API_KEY = os.getenv("NONGSARO_API_KEY")
@@ -11,6 +15,9 @@ API_KEY = os.getenv("NONGSARO_API_KEY")
 OUTPUT_DIR = "app/data"
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
+GUIDE_FIELDS = ("cntntsNo", "cntntsSj", "cn", "safeacdntSeNm", "knmcNm")
+ACCIDENT_LIST_FIELDS = ("cntntsNo", "cntntsSj", "knmcCodeNm", "safeAcdntSeCodeNm")
+
 GUIDE_URL = "http://api.nongsaro.go.kr/service/machineSafety/machineSafetyLst"
 ACCIDENT_LIST_URL = "http://api.nongsaro.go.kr/service/agriAccident/agriAccidentLst"
 ACCIDENT_DETAIL_URL = "http://api.nongsaro.go.kr/service/agriAccident/agriAccidentDtl"
@@ -28,57 +35,61 @@ def fetch_api_data(url, params):
 
 
 def parse_guide_data(xml_str):
-    root = ET.fromstring(xml_str)
-    items = []
-    for item in root.findall(".//item"):
-        items.append({
-            "cntntsNo": item.findtext("cntntsNo", ""),
-            "cntntsSj": item.findtext("cntntsSj", ""),
-            "cn": item.findtext("cn", ""),
-            "safeacdntSeNm": item.findtext("safeacdntSeNm", ""),
-            "knmcNm": item.findtext("knmcNm", "")
-        })
-    return items
+    return parse_items(xml_str, fields=GUIDE_FIELDS)
+
+
+async def fetch_all_guides():
+    """안전지침 전체 페이지 (1페이지의 totalCount 기준으로 나머지 페이지 동시 수집)"""
+    try:
+        return await fetch_all_pages(GUIDE_URL, {"apiKey": API_KEY}, fields=GUIDE_FIELDS)
+    finally:
+        await close_client()
 
 
 def parse_accident_list(xml_str):
-    root = ET.fromstring(xml_str)
-    return root.findall(".//item")
+    return parse_items(xml_str, fields=ACCIDENT_LIST_FIELDS)
 
 
-def fetch_accident_detail(cntntsNo):
+async def fetch_accident_detail(cntntsNo):
     params = {
         "apiKey": API_KEY,
         "cntntsNo": cntntsNo
     }
     try:
-        response = requests.get(ACCIDENT_DETAIL_URL, params=params)
+        response = await nongsaro_get(ACCIDENT_DETAIL_URL, params=params)
         response.raise_for_status()
-        root = ET.fromstring(response.content)
-        return root.findtext(".//cn") or root.findtext(".//atpnCn") or ""
+        item = first_item(response.content) or {}
+        return item.get("cn") or item.get("atpnCn") or ""
     except Exception as e:
         print(f"⚠️ 상세 API 오류 (cntntsNo={cntntsNo}): {e}")
         return ""
 
 
+async def fetch_accident_details(cntntsNos, concurrency=FANOUT_CONCURRENCY):
+    """상세 본문을 동시에 수집 → {cntntsNo: 본문}"""
+    details = {}
+    try:
+        with tqdm(total=len(cntntsNos), desc="📦 사고사례 상세 수집") as progress:
+            async for cntntsNo, detail in iter_fan_out(cntntsNos, fetch_accident_detail, concurrency):
+                details[cntntsNo] = detail
+                progress.update(1)
+    finally:
+        await close_client()
+    return details
+
+
 def save_json(data, filename):
     with open(os.path.join(OUTPUT_DIR, filename), "w", encoding="utf-8") as f:
         json.dump(data, f, ensure_ascii=False, indent=2)
 
 
 def main():
-    guide_params = {
-        "apiKey": API_KEY,
-        "pageNo": 1,
-        "numOfRows": 100
-    }
-    guide_xml = fetch_api_data(GUIDE_URL, guide_params)
-    if guide_xml:
-        guide_data = parse_guide_data(guide_xml)
+    try:
+        guide_data = asyncio.run(fetch_all_guides())
         save_json(guide_data, "safety_guide_data.json")
         print(f"✅ 안전지침 {len(guide_data)}건 저장 완료")
-    else:
-        print("❌ 안전지침 API 실패")
+    except Exception as e:
+        print(f"❌ 안전지침 API 실패: {e}")
 
 
     accident_params = {
@@ -89,13 +100,14 @@ def main():
     accident_xml = fetch_api_data(ACCIDENT_LIST_URL, accident_params)
     if accident_xml:
         list_items = parse_accident_list(accident_xml)
+        details = asyncio.run(fetch_accident_details([item["cntntsNo"] for item in list_items]))
         accident_data = []
-        for item in tqdm(list_items, desc="📦 사고사례 상세 수집"):
-            cntntsNo = item.findtext("cntntsNo", "")
-            cntntsSj = item.findtext("cntntsSj", "")
-            knmcCodeNm = item.findtext("knmcCodeNm", "")
-            safeAcdntSeCodeNm = item.findtext("safeAcdntSeCodeNm", "")
-            detail = fetch_accident_detail(cntntsNo).strip()
+        for item in list_items:
+            cntntsNo = item["cntntsNo"]
+            cntntsSj = item["cntntsSj"]
+            knmcCodeNm = item["knmcCodeNm"]
+            safeAcdntSeCodeNm = item["safeAcdntSeCodeNm"]
+            detail = details.get(cntntsNo, "").strip()
 
             if detail:
                 accident_data.append({
@@ -0,0 +1,296 @@
+import os
+import re
+import json
+import time
+import asyncio
+import sqlite3
+import httpx
+from contextlib import contextmanager
+from dotenv import load_dotenv
+from app.nongsaro.http_client import nongsaro_get
+from app.nongsaro.fanout import iter_fan_out
+from app.nongsaro.xml_parser import first_item
+from app.nongsaro.paging import fetch_all_pages
+
+load_dotenv()
+API_KEY = os.getenv("NONGSARO_API_KEY")
+
+GUIDE_URL = "http://api.nongsaro.go.kr/service/machineSafety/machineSafetyLst"
+ACCIDENT_LIST_URL = "http://api.nongsaro.go.kr/service/agriAccident/agriAccidentLst"
+ACCIDENT_DETAIL_URL = "http://api.nongsaro.go.kr/service/agriAccident/agriAccidentDtl"
+
+DB_FILE = os.getenv(
+    "SAFETY_MIRROR_DB",
+    os.path.join(os.path.dirname(__file__), "..", "..", "data", "safety_mirror.db"),
+)
+
+# 백그라운드 동기화 주기(초), 0이면 동기화 작업을 띄우지 않음
+SYNC_INTERVAL = float(os.getenv("SAFETY_MIRROR_SYNC_INTERVAL", "21600"))
+
+# 목록 페이지 크기 / 상세 조회 동시 요청 수
+PAGE_SIZE = 100
+DETAIL_CONCURRENCY = 5
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS safety_guide (
+    cntntsNo TEXT PRIMARY KEY,
+    knmcNm TEXT,
+    safeacdntSeNm TEXT,
+    position INTEGER,
+    item TEXT NOT NULL,
+    synced_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_guide_knmc ON safety_guide (knmcNm, position);
+CREATE INDEX IF NOT EXISTS idx_guide_se ON safety_guide (safeacdntSeNm, position);
+
+CREATE TABLE IF NOT EXISTS accident_case (
+    cntntsNo TEXT PRIMARY KEY,
+    knmcCodeNm TEXT,
+    safeAcdntSeCodeNm TEXT,
+    position INTEGER,
+    item TEXT NOT NULL,
+    detail TEXT,
+    synced_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_accident_knmc ON accident_case (knmcCodeNm, position);
+CREATE INDEX IF NOT EXISTS idx_accident_se ON accident_case (safeAcdntSeCodeNm, position);
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    name TEXT PRIMARY KEY,
+    synced_at REAL,
+    count INTEGER,
+    took_ms REAL,
+    last_error TEXT
+);
+"""
+
+# 테이블별 (필터 가능 컬럼)
+TABLES = {
+    "safety_guide": ("knmcNm", "safeacdntSeNm"),
+    "accident_case": ("knmcCodeNm", "safeAcdntSeCodeNm"),
+}
+
+
+_API_KEY_PARAM = re.compile(r"(apiKey=)[^&\s'\"]+")
+
+
+def _error_summary(e):
+    """로그/상태 조회용 오류 요약 (요청 URL에 들어 있는 apiKey가 남지 않도록)"""
+    if isinstance(e, httpx.HTTPStatusError):
+        return f"HTTP {e.response.status_code}"
+    return _API_KEY_PARAM.sub(r"\1***", f"{type(e).__name__}: {e}")
+
+
+async def _write(func, *args, **kwargs):
+    """
+    SQLite 쓰기를 스레드에서 실행
+    태스크가 취소돼도(앱 종료) 쓰기는 끝까지 기다린 뒤 취소를 전파
+    """
+    task = asyncio.ensure_future(asyncio.to_thread(func, *args, **kwargs))
+    try:
+        return await asyncio.shield(task)
+    except asyncio.CancelledError:
+        await asyncio.wait([task])
+        raise
+
+
+class SafetyMirror:
+    """
+    농작업 안전지침/사고사례 로컬 미러 (SQLite)
+    - 목록은 업스트림 순서(position) 그대로 저장, 필터 컬럼에 인덱스
+    - 사고사례 상세는 새로 생긴 건만 가져옴 (증분 동기화)
+    - 업스트림이 죽어도 마지막으로 동기화된 데이터로 계속 응답
+    읽기는 호출마다 짧은 연결을 열고, 쓰기는 동기화 작업 한 곳에서만 함
+    """
+
+    def __init__(self, path=DB_FILE):
+        self.path = path
+        self._ready = False
+        self._sync_lock = asyncio.Lock()
+
+    @contextmanager
+    def _connect(self):
+        if not self._ready:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        try:
+            if not self._ready:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(SCHEMA)
+                self._ready = True
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # ---------- 읽기 ----------
+
+    def is_synced(self, table):
+        """한 번이라도 동기화가 끝났는지 (아니면 라우터가 업스트림으로 대체)"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT 1 FROM sync_state WHERE name = ? AND count IS NOT NULL", (table,)).fetchone()
+        return row is not None
+
+    def list(self, table, page=1, rows=100, **filters):
+        """필터 + 페이지 단위 목록 → (전체 건수, items), rows가 None이면 전체"""
+        columns = TABLES[table]
+        where = []
+        args = []
+        for column, value in filters.items():
+            if column not in columns:
+                raise ValueError(f"필터할 수 없는 컬럼: {column}")
+            if value:
+                where.append(f"{column} = ?")
+                args.append(value)
+        clause = f"WHERE {' AND '.join(where)}" if where else ""
+
+        with self._connect() as conn:
+            total = conn.execute(f"SELECT COUNT(*) FROM {table} {clause}", args).fetchone()[0]
+            cursor = conn.execute(
+                f"SELECT item FROM {table} {clause} ORDER BY position LIMIT ? OFFSET ?",
+                args + ([-1, 0] if rows is None else [rows, (max(page, 1) - 1) * rows]),
+            )
+            items = [json.loads(row["item"]) for row in cursor]
+        return total, items
+
+    def accident_detail(self, cntntsNo):
+        """저장된 사고사례 상세 (없으면 None)"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT detail FROM accident_case WHERE cntntsNo = ?", (cntntsNo,)).fetchone()
+        if row is None or row["detail"] is None:
+            return None
+        return json.loads(row["detail"])
+
+    def accident_details(self, cntntsNos):
+        """여러 건 한 번에 조회 → {cntntsNo: 상세} (상세가 없는 건은 빠짐)"""
+        found = {}
+        keys = list(dict.fromkeys(cntntsNos))
+        with self._connect() as conn:
+            # SQLite 바인딩 변수 개수 제한 때문에 나눠서 조회
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                cursor = conn.execute(
+                    f"SELECT cntntsNo, detail FROM accident_case "
+                    f"WHERE detail IS NOT NULL AND cntntsNo IN ({', '.join('?' for _ in chunk)})",
+                    chunk,
+                )
+                found.update((row["cntntsNo"], json.loads(row["detail"])) for row in cursor)
+        return found
+
+    def save_accident_detail(self, cntntsNo, detail):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE accident_case SET detail = ? WHERE cntntsNo = ?",
+                (json.dumps(detail, ensure_ascii=False), cntntsNo),
+            )
+
+    def values(self, table, column):
+        """필터 드롭다운용 값별 건수"""
+        if column not in TABLES[table]:
+            raise ValueError(f"필터할 수 없는 컬럼: {column}")
+        with self._connect() as conn:
+            cursor = conn.execute(
+                f"SELECT {column} AS value, COUNT(*) AS count FROM {table} "
+                f"WHERE {column} != '' GROUP BY {column} ORDER BY count DESC, value"
+            )
+            return [dict(row) for row in cursor]
+
+    def status(self):
+        with self._connect() as conn:
+            return [dict(row) for row in conn.execute("SELECT * FROM sync_state ORDER BY name")]
+
+    # ---------- 쓰기 (동기화) ----------
+
+    def _replace_list(self, table, items, columns):
+        """목록 전체를 upsert하고 목록에서 사라진 건은 삭제 (상세는 유지)"""
+        now = time.time()
+        rows = [
+            (item.get("cntntsNo", ""), *(item.get(c, "") for c in columns), position,
+             json.dumps(item, ensure_ascii=False), now)
+            for position, item in enumerate(items)
+            if item.get("cntntsNo")
+        ]
+        if not rows:
+            raise ValueError("업스트림 목록이 비어 있음 (기존 데이터 유지)")
+        names = ", ".join(columns)
+        marks = ", ".join("?" for _ in columns)
+        updates = ", ".join(f"{c} = excluded.{c}" for c in (*columns, "position", "item", "synced_at"))
+        with self._connect() as conn:
+            conn.executemany(
+                f"INSERT INTO {table} (cntntsNo, {names}, position, item, synced_at) "
+                f"VALUES (?, {marks}, ?, ?, ?) ON CONFLICT(cntntsNo) DO UPDATE SET {updates}",
+                rows,
+            )
+            conn.execute(f"DELETE FROM {table} WHERE synced_at < ?", (now,))
+        return len(rows)
+
+    def _missing_details(self):
+        with self._connect() as conn:
+            return [row[0] for row in conn.execute("SELECT cntntsNo FROM accident_case WHERE detail IS NULL")]
+
+    def _record(self, name, count=None, took_ms=None, error=None):
+        with self._connect() as conn:
+            if error is None:
+                conn.execute(
+                    "INSERT INTO sync_state (name, synced_at, count, took_ms, last_error) VALUES (?, ?, ?, ?, NULL) "
+                    "ON CONFLICT(name) DO UPDATE SET synced_at = excluded.synced_at, count = excluded.count, "
+                    "took_ms = excluded.took_ms, last_error = NULL",
+                    (name, time.time(), count, took_ms),
+                )
+            else:
+                conn.execute(
+                    "INSERT INTO sync_state (name, last_error) VALUES (?, ?) "
+                    "ON CONFLICT(name) DO UPDATE SET last_error = excluded.last_error",
+                    (name, error),
+                )
+
+    async def sync(self):
+        """안전지침 + 사고사례 목록 전체와 새 사고사례 상세를 가져와 저장 (동시에 한 번만 실행)"""
+        async with self._sync_lock:
+            await self._sync()
+
+    async def _sync(self):
+        for table, url in (("safety_guide", GUIDE_URL), ("accident_case", ACCIDENT_LIST_URL)):
+            started = time.perf_counter()
+            try:
+                items = await fetch_all_pages(url, {"apiKey": API_KEY}, page_size=PAGE_SIZE)
+                count = await _write(self._replace_list, table, items, TABLES[table])
+                if table == "accident_case":
+                    await self._sync_details()
+            except Exception as e:
+                error = _error_summary(e)
+                print(f"⚠️ 안전 데이터 동기화 실패 ({table}): {error}")
+                await _write(self._record, table, error=error)
+                continue
+            took_ms = round((time.perf_counter() - started) * 1000, 1)
+            await _write(self._record, table, count, took_ms)
+            print(f"✅ 안전 데이터 동기화 완료 ({table}): {count}건, {took_ms}ms")
+
+    async def _sync_details(self):
+        missing = await asyncio.to_thread(self._missing_details)
+        async for cntntsNo, detail in iter_fan_out(missing, fetch_accident_detail, DETAIL_CONCURRENCY):
+            if isinstance(detail, Exception):
+                # 다음 동기화 때 다시 시도
+                print(f"⚠️ 사고사례 상세 동기화 실패 (cntntsNo={cntntsNo}): {_error_summary(detail)}")
+            elif detail is not None:
+                await _write(self.save_accident_detail, cntntsNo, detail)
+
+
+async def fetch_accident_detail(cntntsNo):
+    response = await nongsaro_get(ACCIDENT_DETAIL_URL, params={"apiKey": API_KEY, "cntntsNo": cntntsNo})
+    response.raise_for_status()
+    return first_item(response.content)
+
+
+async def run_sync_loop(interval=SYNC_INTERVAL):
+    """앱 시작 시 1회 + interval마다 동기화 (lifespan에서 태스크로 실행)"""
+    while True:
+        try:
+            await mirror.sync()
+        except Exception as e:
+            print(f"⚠️ 안전 데이터 동기화 오류: {_error_summary(e)}")
+        await asyncio.sleep(interval)
+
+
+mirror = SafetyMirror()
@@ -0,0 +1,116 @@
+import numpy as np
+from app.domain.map.rental_data import EQUIPMENT_FIELDS, get_rental_markers
+
+# 카카오맵 레벨 (1: 가장 확대 ~ 14: 가장 축소), 이 레벨부터 서버에서 묶어서 반환
+CLUSTER_MIN_LEVEL = 6
+MAX_LEVEL = 14
+# CLUSTER_MIN_LEVEL에서의 격자 한 칸 크기(도), 레벨이 1 오를 때마다 2배
+BASE_CELL_DEGREES = 0.04
+
+# 개별 마커로 반환할 최대 개수
+MAX_MARKERS = 3000
+
+EQUIPMENT_KEYS = tuple(EQUIPMENT_FIELDS)
+
+
+def cell_degrees(level):
+    return BASE_CELL_DEGREES * 2 ** (level - CLUSTER_MIN_LEVEL)
+
+
+class _LevelClusters:
+    """한 레벨의 격자 클러스터 (배열 단위로 보관)"""
+
+    def __init__(self, lat, lng, counts, has_other, cell):
+        cell_lat = np.floor(lat / cell).astype(np.int64)
+        cell_lng = np.floor(lng / cell).astype(np.int64)
+        keys = np.stack([cell_lat, cell_lng], axis=1)
+        _, inverse, sizes = np.unique(keys, axis=0, return_inverse=True, return_counts=True)
+        inverse = inverse.ravel()
+
+        self.size = sizes.astype(np.int64)
+        self.lat = np.bincount(inverse, weights=lat) / sizes
+        self.lng = np.bincount(inverse, weights=lng) / sizes
+        self.equipment = np.stack(
+            [np.bincount(inverse, weights=counts[:, c], minlength=len(sizes)) for c in range(counts.shape[1])],
+            axis=1,
+        ).astype(np.int64)
+        self.other = np.bincount(inverse, weights=has_other, minlength=len(sizes)).astype(np.int64)
+
+    def within(self, sw_lat, sw_lng, ne_lat, ne_lng):
+        mask = (self.lat >= sw_lat) & (self.lat <= ne_lat) & (self.lng >= sw_lng) & (self.lng <= ne_lng)
+        rows = np.flatnonzero(mask)
+        return [
+            {
+                "lat": round(lat, 6),
+                "lng": round(lng, 6),
+                "count": size,
+                "equipment": dict(zip(EQUIPMENT_KEYS, equipment)),
+                "other": other,
+            }
+            for lat, lng, size, equipment, other in zip(
+                self.lat[rows].tolist(), self.lng[rows].tolist(), self.size[rows].tolist(),
+                self.equipment[rows].tolist(), self.other[rows].tolist(),
+            )
+        ]
+
+
+class RentalClusters:
+    """
+    화면 영역(bbox) + 지도 레벨별 마커/클러스터 (데이터 스냅샷마다 1회 생성)
+    - 레벨별 격자 클러스터(중심 좌표, 사업소 수, 장비별 보유대수 합)를 미리 계산
+    - 확대 레벨에서는 위도순 정렬 배열 + searchsorted로 화면 안의 개별 사업소만 반환
+    """
+
+    def __init__(self, rental):
+        self.rental = rental
+        rows = [i for i, m in enumerate(rental.markers) if m["lat"] is not None and m["lng"] is not None]
+        lat = np.asarray([rental.markers[i]["lat"] for i in rows], dtype=np.float64)
+        lng = np.asarray([rental.markers[i]["lng"] for i in rows], dtype=np.float64)
+        counts = np.asarray(
+            [[rental.markers[i][key] for key in EQUIPMENT_KEYS] for i in rows], dtype=np.int64
+        ).reshape(len(rows), len(EQUIPMENT_KEYS))
+        has_other = np.asarray([bool((rental.markers[i].get("other") or "").strip()) for i in rows], dtype=np.float64)
+
+        order = np.argsort(lat, kind="stable")
+        self._ids = np.asarray(rows, dtype=np.int64)[order]
+        self._lat = lat[order]
+        self._lng = lng[order]
+
+        self.levels = {}
+        if rows:
+            for level in range(CLUSTER_MIN_LEVEL, MAX_LEVEL + 1):
+                self.levels[level] = _LevelClusters(lat, lng, counts, has_other, cell_degrees(level))
+
+    def markers_within(self, sw_lat, sw_lng, ne_lat, ne_lng, limit=MAX_MARKERS):
+        lo = np.searchsorted(self._lat, sw_lat, side="left")
+        hi = np.searchsorted(self._lat, ne_lat, side="right")
+        lng = self._lng[lo:hi]
+        ids = self._ids[lo:hi][(lng >= sw_lng) & (lng <= ne_lng)]
+        ids = np.sort(ids)
+        return len(ids), [self.rental.markers[i] for i in ids[:limit].tolist()]
+
+    def query(self, sw_lat, sw_lng, ne_lat, ne_lng, level):
+        """level이 CLUSTER_MIN_LEVEL 이상이면 클러스터, 아니면 개별 사업소"""
+        level = min(level, MAX_LEVEL)
+        if level >= CLUSTER_MIN_LEVEL:
+            clusters = self.levels[level].within(sw_lat, sw_lng, ne_lat, ne_lng) if self.levels else []
+            return {
+                "level": level,
+                "clustered": True,
+                "count": sum(c["count"] for c in clusters),
+                "clusters": clusters,
+            }
+
+        total, markers = self.markers_within(sw_lat, sw_lng, ne_lat, ne_lng)
+        return {
+            "level": level,
+            "clustered": False,
+            "count": total,
+            "truncated": total > len(markers),
+            "markers": markers,
+        }
+
+
+def get_clusters():
+    """현재 마커 스냅샷의 bbox/클러스터 색인"""
+    return get_rental_markers().derived("clusters", RentalClusters)
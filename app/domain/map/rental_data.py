@@ -0,0 +1,95 @@
+import re
+import gzip
+import json
+import hashlib
+import threading
+from app.snapshot import registry
+
+DATA_FILE = "전국농기계임대정보표준데이터.json"
+
+# 마커 키 → 원본 보유대수 필드
+EQUIPMENT_FIELDS = {
+    "tractor": "트랙터및작업기보유대수",
+    "cultivator": "경운기및작업기보유대수",
+    "manager": "관리기및작업기보유대수",
+    "rootcrop": "땅속작물수확기보유대수",
+    "thresher": "탈곡기및정선작업기보유대수",
+    "seeder": "자주형파종기보유대수",
+    "riceTransplanter": "이앙작업기보유대수",
+    "riceHarvester": "벼수확및운반작업기보유대수",
+}
+
+_DIGITS = re.compile(r"\d+")
+
+
+def parse_count(value):
+    """'12', '12대', '1,200', '' → 정수 (숫자가 없으면 0)"""
+    if isinstance(value, (int, float)):
+        return int(value)
+    match = _DIGITS.search((value or "").replace(",", ""))
+    return int(match.group()) if match else 0
+
+
+def _parse_coord(value):
+    try:
+        return float(value) if value and str(value).strip() else None
+    except ValueError:
+        return None
+
+
+def build_markers(data):
+    markers = []
+    for item in data.get("records", []):
+        marker = {
+            "name": item.get("사업소명", ""),
+            "lat": _parse_coord(item.get("위도", "")),
+            "lng": _parse_coord(item.get("경도", "")),
+            "address": item.get("소재지도로명주소", ""),
+            "phone": item.get("사업소전화번호", ""),
+        }
+        for key, field in EQUIPMENT_FIELDS.items():
+            marker[key] = parse_count(item.get(field))
+        # 원본에 null로 들어 있는 경우도 빈 문자열로 (마커 소비 쪽에서 .strip() 사용)
+        marker["other"] = item.get("기타임대농기계보유정보") or ""
+        markers.append(marker)
+    return markers
+
+
+class RentalMarkers:
+    """
+    임대사업소 마커 (데이터 스냅샷마다 1회 생성)
+    - 응답 본문을 미리 JSON 직렬화 + gzip 압축해 두고 ETag로 재방문 시 304
+    - 보유대수는 빌드 시점에 정수로 변환
+    - 공간 색인/클러스터/지역 집계 등 파생 데이터는 derived()로 스냅샷당 1회 생성
+    """
+
+    def __init__(self, data):
+        self.markers = build_markers(data)
+        self.body = json.dumps(self.markers, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        # mtime=0: 같은 데이터면 압축 결과도 항상 같도록
+        self.gzipped = gzip.compress(self.body, compresslevel=9, mtime=0)
+        self.etag = f'"{hashlib.sha256(self.body).hexdigest()[:32]}"'
+
+        self._derived = {}
+        self._derived_lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.markers)
+
+    def derived(self, key, factory):
+        value = self._derived.get(key)
+        if value is None:
+            with self._derived_lock:
+                value = self._derived.get(key)
+                if value is None:
+                    value = factory(self)
+                    self._derived[key] = value
+        return value
+
+
+registry.register("rental_markers", DATA_FILE, build=RentalMarkers)
+
+
+def get_rental_markers():
+    """현재 데이터 스냅샷의 마커 (파일이 바뀌면 레지스트리가 새로 빌드)"""
+    return registry.value("rental_markers")
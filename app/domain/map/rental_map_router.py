@@ -1,37 +1,82 @@
-import json
-from fastapi import APIRouter
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Request, Query, HTTPException
+from fastapi.responses import Response
+from app.domain.map.rental_data import get_rental_markers
+from app.domain.map.rental_spatial import get_spatial_index, EQUIPMENT_KEYS
+from app.domain.map.rental_cluster import get_clusters, MAX_LEVEL
+from app.domain.map.rental_region import get_regions
 
 router = APIRouter(prefix="/api/map", tags=["지도"])
 
+
+def _etag_matches(request: Request, etag):
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return etag in candidates or "*" in candidates
+
+
 @router.get("/rental-locations")
-async def get_rental_locations():
-    with open("app/data/전국농기계임대정보표준데이터.json", "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    markers = []
-    for item in data.get("records", []):
-        lat = item.get("위도", "")
-        lng = item.get("경도", "")
-        
-        lat_value = float(lat) if lat and lat.strip() else None
-        lng_value = float(lng) if lng and lng.strip() else None
-        
-        markers.append({
-            "name": item.get("사업소명", ""),
-            "lat": lat_value,
-            "lng": lng_value,
-            "address": item.get("소재지도로명주소", ""),
-            "phone": item.get("사업소전화번호", ""),
-            "tractor": item.get("트랙터및작업기보유대수", "0"),
-            "cultivator": item.get("경운기및작업기보유대수", "0"),
-            "manager": item.get("관리기및작업기보유대수", "0"),
-            "rootcrop": item.get("땅속작물수확기보유대수", "0"),
-            "thresher": item.get("탈곡기및정선작업기보유대수", "0"),
-            "seeder": item.get("자주형파종기보유대수", "0"),
-            "riceTransplanter": item.get("이앙작업기보유대수", "0"),
-            "riceHarvester": item.get("벼수확및운반작업기보유대수", "0"),
-            "other": item.get("기타임대농기계보유정보", ""),
-        })
-
-    return JSONResponse(content=markers)
\ No newline at end of file
+async def get_rental_locations(request: Request):
+    payload = get_rental_markers()
+    headers = {
+        "ETag": payload.etag,
+        # 매번 ETag로 재검증 (데이터가 바뀌면 바로 새 응답)
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding",
+    }
+    if _etag_matches(request, payload.etag):
+        return Response(status_code=304, headers=headers)
+
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=payload.gzipped, media_type="application/json", headers=headers)
+    return Response(content=payload.body, media_type="application/json", headers=headers)
+
+
+def _parse_equipment(equipment):
+    keys = [e.strip() for e in (equipment or "").split(",") if e.strip()]
+    unknown = [e for e in keys if e not in EQUIPMENT_KEYS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"알 수 없는 장비 종류: {', '.join(unknown)} (가능: {', '.join(EQUIPMENT_KEYS)})",
+        )
+    return keys
+
+
+@router.get("/nearby")
+def get_nearby_rental_offices(
+    lat: float = Query(..., ge=-90, le=90, description="위도"),
+    lng: float = Query(..., ge=-180, le=180, description="경도"),
+    k: int = Query(10, ge=1, le=100, description="최대 개수"),
+    radius: float = Query(None, gt=0, le=1000, description="반경(km)"),
+    equipment: str = Query(None, description="보유해야 하는 장비 (쉼표 구분, 예: riceTransplanter,tractor)"),
+):
+    """가까운 임대사업소 (haversine 거리순, 좌표 없는 사업소는 제외)"""
+    keys = _parse_equipment(equipment)
+    results = get_spatial_index().nearby(lat, lng, k, radius, keys)
+    return {"count": len(results), "results": results}
+
+
+@router.get("/rental-locations/viewport")
+def get_rental_locations_in_viewport(
+    swLat: float = Query(..., ge=-90, le=90, description="남서쪽 위도"),
+    swLng: float = Query(..., ge=-180, le=180, description="남서쪽 경도"),
+    neLat: float = Query(..., ge=-90, le=90, description="북동쪽 위도"),
+    neLng: float = Query(..., ge=-180, le=180, description="북동쪽 경도"),
+    level: int = Query(..., ge=1, le=MAX_LEVEL, description="카카오맵 레벨 (1: 확대 ~ 14: 축소)"),
+):
+    """화면 영역 안의 사업소 (축소 레벨에서는 격자 클러스터 + 장비별 보유대수 합)"""
+    if swLat > neLat or swLng > neLng:
+        raise HTTPException(status_code=400, detail="남서쪽 좌표가 북동쪽 좌표보다 클 수 없습니다.")
+    return get_clusters().query(swLat, swLng, neLat, neLng, level)
+
+
+@router.get("/regions")
+def get_rental_region_summary(province: str = Query(None, description="시도명 (없으면 시도별, 있으면 해당 시도의 시군구별)")):
+    """지역별 임대사업소 수와 장비별 보유대수 합계 (소재지도로명주소 기준)"""
+    regions = get_regions().summary(province)
+    if regions is None:
+        raise HTTPException(status_code=404, detail="해당 시도의 임대사업소가 없습니다.")
+    return {"province": province, "regions": regions}
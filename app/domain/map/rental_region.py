@@ -0,0 +1,104 @@
+import numpy as np
+from app.domain.map.rental_data import EQUIPMENT_FIELDS, get_rental_markers
+
+EQUIPMENT_KEYS = tuple(EQUIPMENT_FIELDS)
+
+# 주소 첫 단어의 약칭/옛 명칭 → 현재 시도명
+PROVINCE_ALIASES = {
+    "서울": "서울특별시",
+    "부산": "부산광역시",
+    "대구": "대구광역시",
+    "인천": "인천광역시",
+    "광주": "광주광역시",
+    "대전": "대전광역시",
+    "울산": "울산광역시",
+    "세종": "세종특별자치시",
+    "경기": "경기도",
+    "강원": "강원특별자치도",
+    "강원도": "강원특별자치도",
+    "충북": "충청북도",
+    "충남": "충청남도",
+    "전북": "전북특별자치도",
+    "전라북도": "전북특별자치도",
+    "전남": "전라남도",
+    "경북": "경상북도",
+    "경남": "경상남도",
+    "제주": "제주특별자치도",
+    "제주도": "제주특별자치도",
+}
+
+UNKNOWN = "미상"
+
+
+def split_region(address):
+    """도로명주소 → (시도, 시군구) / 시군구가 없으면(세종 등) ''"""
+    tokens = (address or "").split()
+    if not tokens:
+        return UNKNOWN, ""
+    province = PROVINCE_ALIASES.get(tokens[0], tokens[0])
+    city = tokens[1] if len(tokens) > 1 and tokens[1][-1] in "시군구" else ""
+    return province, city
+
+
+class RentalRegions:
+    """
+    시도/시군구별 임대사업소 수, 장비별 보유대수 합 (데이터 스냅샷마다 1회 계산)
+    - 지역명은 정렬된 문자열 표 + 코드 배열, 합계는 (지역 수 x 장비 수) 정수 배열로 보관
+    """
+
+    def __init__(self, rental):
+        regions = [split_region(m["address"]) for m in rental.markers]
+        counts = np.asarray(
+            [[m[key] for key in EQUIPMENT_KEYS] for m in rental.markers], dtype=np.int64
+        ).reshape(len(rental.markers), len(EQUIPMENT_KEYS))
+        has_other = np.asarray([bool((m.get("other") or "").strip()) for m in rental.markers], dtype=np.int64)
+
+        self.provinces = sorted({p for p, _ in regions})
+        province_lookup = {name: code for code, name in enumerate(self.provinces)}
+        province_codes = np.asarray([province_lookup[p] for p, _ in regions], dtype=np.int64)
+        self.province_totals = self._sum(province_codes, len(self.provinces), counts, has_other)
+
+        self.cities = sorted(set(regions))
+        city_lookup = {key: code for code, key in enumerate(self.cities)}
+        city_codes = np.asarray([city_lookup[key] for key in regions], dtype=np.int64)
+        self.city_totals = self._sum(city_codes, len(self.cities), counts, has_other)
+
+    @staticmethod
+    def _sum(codes, size, counts, has_other):
+        """[지역, (사업소 수, 기타보유 사업소 수, 장비별 합...)]"""
+        table = np.zeros((size, 2 + counts.shape[1]), dtype=np.int64)
+        np.add.at(table[:, 0], codes, 1)
+        np.add.at(table[:, 1], codes, has_other)
+        np.add.at(table[:, 2:], codes, counts)
+        return table
+
+    @staticmethod
+    def _row(name, values, **extra):
+        values = values.tolist()
+        return {
+            "name": name,
+            **extra,
+            "offices": values[0],
+            "otherOffices": values[1],
+            "equipment": dict(zip(EQUIPMENT_KEYS, values[2:])),
+            "total": sum(values[2:]),
+        }
+
+    def summary(self, province=None):
+        """province가 없으면 시도별, 있으면 해당 시도의 시군구별"""
+        if not province:
+            return [self._row(name, row) for name, row in zip(self.provinces, self.province_totals)]
+
+        province = PROVINCE_ALIASES.get(province, province)
+        if province not in self.provinces:
+            return None
+        return [
+            self._row(city or province, row, province=province)
+            for (p, city), row in zip(self.cities, self.city_totals)
+            if p == province
+        ]
+
+
+def get_regions():
+    """현재 마커 스냅샷의 지역별 집계"""
+    return get_rental_markers().derived("regions", RentalRegions)
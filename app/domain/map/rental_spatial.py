@@ -0,0 +1,113 @@
+import math
+import threading
+from collections import OrderedDict
+import numpy as np
+from app.domain.map.rental_data import EQUIPMENT_FIELDS, get_rental_markers
+
+EARTH_RADIUS_KM = 6371.0088
+
+# 장비 필터 조합별 KD-tree 캐시 개수
+MAX_FILTER_TREES = 32
+
+EQUIPMENT_KEYS = tuple(EQUIPMENT_FIELDS) + ("other",)
+
+
+def to_xyz(lat, lng):
+    """위경도(도) → 단위 구 위의 3차원 좌표 (유클리드 거리 순서 = 대권 거리 순서)"""
+    lat = np.radians(lat)
+    lng = np.radians(lng)
+    cos_lat = np.cos(lat)
+    return np.column_stack([cos_lat * np.cos(lng), cos_lat * np.sin(lng), np.sin(lat)])
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    lat1, lng1, lat2, lng2 = map(np.radians, (lat1, lng1, lat2, lng2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def _chord(radius_km):
+    """대권 거리(km) → 단위 구 위의 직선(현) 거리"""
+    return 2 * math.sin(min(radius_km / EARTH_RADIUS_KM, math.pi) / 2)
+
+
+class RentalSpatialIndex:
+    """
+    임대사업소 위치 KD-tree (데이터 스냅샷마다 1회 생성)
+    - 좌표가 있는 사업소만 색인, 위경도를 3차원 단위 벡터로 바꿔 cKDTree에 넣음
+    - 장비 필터가 있으면 해당 장비를 보유한 사업소만으로 만든 트리를 조합별로 캐시
+    - 최종 거리는 haversine(km)으로 계산
+    """
+
+    def __init__(self, rental):
+        from scipy.spatial import cKDTree
+
+        self.rental = rental
+        rows = [i for i, m in enumerate(rental.markers) if m["lat"] is not None and m["lng"] is not None]
+        self.ids = np.asarray(rows, dtype=np.int64)
+        self.lat = np.asarray([rental.markers[i]["lat"] for i in rows], dtype=np.float64)
+        self.lng = np.asarray([rental.markers[i]["lng"] for i in rows], dtype=np.float64)
+        self.xyz = to_xyz(self.lat, self.lng)
+
+        # 보유 여부 행렬 (행: 색인된 사업소, 열: EQUIPMENT_KEYS)
+        self.has = np.zeros((len(rows), len(EQUIPMENT_KEYS)), dtype=bool)
+        for col, key in enumerate(EQUIPMENT_KEYS):
+            if key == "other":
+                self.has[:, col] = [bool((rental.markers[i].get("other") or "").strip()) for i in rows]
+            else:
+                self.has[:, col] = [rental.markers[i][key] > 0 for i in rows]
+
+        self._cKDTree = cKDTree
+        self._tree = cKDTree(self.xyz) if len(rows) else None
+        self._filter_trees = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _tree_for(self, equipment):
+        """(트리, 트리 인덱스 → 색인 행 번호) / 필터 없으면 전체 트리"""
+        if not equipment:
+            return self._tree, None
+        key = tuple(sorted(equipment))
+        with self._lock:
+            cached = self._filter_trees.get(key)
+            if cached is not None:
+                self._filter_trees.move_to_end(key)
+                return cached
+
+        columns = [EQUIPMENT_KEYS.index(e) for e in key]
+        rows = np.flatnonzero(self.has[:, columns].all(axis=1))
+        tree = self._cKDTree(self.xyz[rows]) if len(rows) else None
+        with self._lock:
+            self._filter_trees[key] = (tree, rows)
+            while len(self._filter_trees) > MAX_FILTER_TREES:
+                self._filter_trees.popitem(last=False)
+        return tree, rows
+
+    def nearby(self, lat, lng, k=10, radius_km=None, equipment=()):
+        """가까운 순 사업소 목록 (각 항목에 distance_km 추가)"""
+        tree, rows = self._tree_for(equipment)
+        if tree is None:
+            return []
+        k = min(k, tree.n)
+        bound = _chord(radius_km) * (1 + 1e-9) if radius_km else np.inf
+        _, found = tree.query(to_xyz(lat, lng)[0], k=k, distance_upper_bound=bound)
+        found = np.atleast_1d(found)
+        found = found[found < tree.n]
+        if rows is not None:
+            found = rows[found]
+
+        distances = haversine_km(lat, lng, self.lat[found], self.lng[found])
+        if radius_km:
+            keep = distances <= radius_km
+            found, distances = found[keep], distances[keep]
+
+        results = []
+        for row, distance in zip(found.tolist(), distances.tolist()):
+            marker = dict(self.rental.markers[self.ids[row]])
+            marker["distance_km"] = round(distance, 3)
+            results.append(marker)
+        return results
+
+
+def get_spatial_index():
+    """현재 마커 스냅샷의 공간 색인"""
+    return get_rental_markers().derived("spatial", RentalSpatialIndex)
@@ -0,0 +1,145 @@
+import os
+import sys
+import json
+import asyncio
+import argparse
+import httpx
+from tenacity import AsyncRetrying, stop_after_attempt, wait_exponential, retry_if_exception_type
+from dotenv import load_dotenv
+
+from app.nongsaro.http_client import get_client, close_client
+from app.nongsaro.xml_parser import parse_items, first_item
+from app.domain.term.term_index import SEARCH_FIELDS, DETAIL_FIELDS
+
+load_dotenv()
+API_KEY = os.getenv("NONGSARO_TERMS_API_KEY")
+
+SEARCH_URL = "http://api.nongsaro.go.kr/service/farmDic/searchFrontMatch"
+DETAIL_URL = "http://api.nongsaro.go.kr/service/farmDic/detailWord"
+
+OUTPUT_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "data", "farm_dic.json")
+
+NUM_OF_ROWS = 100
+CONCURRENCY = 10
+MAX_ATTEMPTS = 4
+
+
+class DictionaryImportError(Exception):
+    pass
+
+
+def seed_prefixes():
+    """
+    전체 목록 API가 없으므로 첫 글자 앞부분 일치 검색으로 사전 전체를 훑음
+    - 한글 음절 11,172자 + 영문/숫자 (결과 없는 음절은 1회 요청으로 끝남)
+    """
+    seeds = [chr(code) for code in range(0xAC00, 0xD7A4)]
+    seeds += [chr(code) for code in range(ord("a"), ord("z") + 1)]
+    seeds += [str(d) for d in range(10)]
+    return seeds
+
+
+async def _get(url, params):
+    async for attempt in AsyncRetrying(
+        stop=stop_after_attempt(MAX_ATTEMPTS),
+        wait=wait_exponential(multiplier=0.5, max=8),
+        retry=retry_if_exception_type(httpx.HTTPError),
+        reraise=True,
+    ):
+        with attempt:
+            response = await get_client().get(url, params=params)
+            response.raise_for_status()
+            return response.content
+
+
+async def fetch_prefix(seed):
+    """seed로 시작하는 용어 전체 (페이지 끝까지)"""
+    items = []
+    page = 1
+    while True:
+        meta = {}
+        content = await _get(SEARCH_URL, {"apiKey": API_KEY, "word": seed, "pageNo": page, "numOfRows": NUM_OF_ROWS})
+        batch = parse_items(content, fields=SEARCH_FIELDS, default=None, meta=meta)
+        items.extend(batch)
+        if not batch or len(items) >= (meta.get("totalCount") or 0):
+            return items
+        page += 1
+
+
+async def fetch_detail(wordNo):
+    content = await _get(DETAIL_URL, {"apiKey": API_KEY, "wordNo": wordNo})
+    return first_item(content, fields=DETAIL_FIELDS, default=None)
+
+
+async def _run_all(coros_factory, keys, concurrency, label):
+    semaphore = asyncio.Semaphore(concurrency)
+    done = 0
+
+    async def run(key):
+        nonlocal done
+        async with semaphore:
+            result = await coros_factory(key)
+        done += 1
+        if done % 500 == 0 or done == len(keys):
+            print(f"📄 {label} {done}/{len(keys)}")
+        return result
+
+    return await asyncio.gather(*(run(key) for key in keys), return_exceptions=True)
+
+
+async def import_farm_dic_async(output_path=OUTPUT_PATH, concurrency=CONCURRENCY, details=True, seeds=None):
+    seeds = seeds or seed_prefixes()
+    print(f"📚 농업용어 사전 수집 시작 (검색 접두어 {len(seeds)}개)")
+
+    by_no = {}
+    failed = 0
+    for result in await _run_all(fetch_prefix, seeds, concurrency, "용어 목록"):
+        if isinstance(result, Exception):
+            failed += 1
+            continue
+        for item in result:
+            if item.get("wordNo"):
+                by_no.setdefault(item["wordNo"], item)
+    if failed:
+        raise DictionaryImportError(f"{failed}개 접두어 수집 실패 - 부분 데이터로 색인을 덮어쓰지 않음")
+
+    if details:
+        word_nos = list(by_no)
+        results = await _run_all(fetch_detail, word_nos, concurrency, "용어 설명")
+        missing = 0
+        for word_no, result in zip(word_nos, results):
+            if isinstance(result, Exception) or result is None:
+                # 설명이 없는 항목은 상세 조회 시 업스트림으로 대체됨
+                missing += 1
+                continue
+            by_no[word_no].update({k: v for k, v in result.items() if v is not None})
+        if missing:
+            print(f"⚠️ 용어 설명 {missing}건 수집 실패")
+
+    items = sorted(by_no.values(), key=lambda item: item.get("wordNm") or "")
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    tmp_path = f"{output_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(items, f, ensure_ascii=False)
+    os.replace(tmp_path, output_path)
+    print(f"✅ 농업용어 사전 저장 완료: {os.path.abspath(output_path)} ({len(items)}건)")
+    return items
+
+
+async def _main(args):
+    try:
+        await import_farm_dic_async(concurrency=args.concurrency, details=not args.no_details)
+    finally:
+        await close_client()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="농업용어 사전 전체를 받아 로컬 검색 색인(farm_dic.json) 생성")
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY, help="동시 요청 수")
+    parser.add_argument("--no-details", action="store_true", help="용어 설명(detailWord)은 받지 않음")
+    args = parser.parse_args()
+    try:
+        asyncio.run(_main(args))
+    except DictionaryImportError as e:
+        print(f"❌ 수집 실패: {e}")
+        sys.exit(1)
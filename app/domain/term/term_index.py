@@ -0,0 +1,146 @@
+from bisect import bisect_left
+from app.snapshot import registry
+
+# 한글 음절 분해용 (유니코드 조합형 순서)
+_HANGUL_BASE = 0xAC00
+_HANGUL_LAST = 0xD7A3
+_CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+_JONGSEONG = ["", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ", "ㄿ", "ㅀ",
+              "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ"]
+
+# 겹모음/겹받침은 자판에서 두 번 누르므로 낱자로 풀어 둠 ('과' 입력 중 '고'도 매칭되도록)
+_SPLIT = {
+    "ㅘ": "ㅗㅏ", "ㅙ": "ㅗㅐ", "ㅚ": "ㅗㅣ", "ㅝ": "ㅜㅓ", "ㅞ": "ㅜㅔ", "ㅟ": "ㅜㅣ", "ㅢ": "ㅡㅣ",
+    "ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ", "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ", "ㄼ": "ㄹㅂ", "ㄽ": "ㄹㅅ",
+    "ㄾ": "ㄹㅌ", "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ", "ㅄ": "ㅂㅅ",
+}
+_CONSONANTS = set(_CHOSEONG)
+
+# 접두어 범위의 상한 (어떤 자모/문자보다 뒤에 정렬됨)
+_MAX_CHAR = "\U0010ffff"
+
+SEARCH_FIELDS = ("wordNm", "langNm", "wordNo", "wordType", "faoCode")
+DETAIL_FIELDS = ("wordNm", "wordNo", "langNm", "wordDc", "faoCode", "wordType")
+
+
+def jamo_key(text):
+    """
+    검색 키: 공백 제거 + 소문자 + 한글 음절을 자모 낱자로 분해
+    '감자' → 'ㄱㅏㅁㅈㅏ' 이므로 입력 중인 '가', '감', '감ㅈ'도 접두어로 매칭
+    (받침이 다음 글자 초성으로 넘어간 '가마' 같은 입력은 'ㄱㅏㅁㅏ'라 매칭되지 않음)
+    """
+    out = []
+    for ch in text.lower():
+        if ch.isspace():
+            continue
+        code = ord(ch)
+        if _HANGUL_BASE <= code <= _HANGUL_LAST:
+            offset = code - _HANGUL_BASE
+            jongseong = _JONGSEONG[offset % 28]
+            out.append(_CHOSEONG[offset // 588])
+            out.append(_SPLIT.get(_JUNGSEONG[(offset // 28) % 21], _JUNGSEONG[(offset // 28) % 21]))
+            out.append(_SPLIT.get(jongseong, jongseong))
+        else:
+            out.append(_SPLIT.get(ch, ch))
+    return "".join(out)
+
+
+def initials_key(text):
+    """초성 검색 키: '감자' → 'ㄱㅈ' (한글이 아닌 글자는 그대로)"""
+    out = []
+    for ch in text.lower():
+        if ch.isspace():
+            continue
+        code = ord(ch)
+        if _HANGUL_BASE <= code <= _HANGUL_LAST:
+            out.append(_CHOSEONG[(code - _HANGUL_BASE) // 588])
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+class _PrefixArray:
+    """정렬된 (키, 항목 번호) 배열 + bisect 접두어 범위"""
+
+    def __init__(self, keyed):
+        keyed.sort()
+        self.keys = [key for key, _ in keyed]
+        self.ids = [i for _, i in keyed]
+
+    def range(self, prefix):
+        lo = bisect_left(self.keys, prefix)
+        hi = bisect_left(self.keys, prefix + _MAX_CHAR, lo)
+        return lo, hi
+
+
+class TermIndex:
+    """
+    농업용어 사전 메모리 색인 (import_farm_dic으로 받은 farm_dic.json 기반)
+    - 자모 분해 키 정렬 배열: 입력 중인 글자(자모 단위)까지 접두어 매칭
+    - 초성 키 정렬 배열: 'ㄱㅈ' 같은 초성만 입력한 경우
+    - wordNo → 항목 dict (상세 조회)
+    """
+
+    def __init__(self, items):
+        self.items = []
+        self._by_no = {}
+        for item in items:
+            word_no = str(item.get("wordNo") or "")
+            if not word_no or word_no in self._by_no or not item.get("wordNm"):
+                continue
+            self._by_no[word_no] = item
+            self.items.append(item)
+
+        self._full = _PrefixArray([(jamo_key(item["wordNm"]), i) for i, item in enumerate(self.items)])
+        self._initials = _PrefixArray([(initials_key(item["wordNm"]), i) for i, item in enumerate(self.items)])
+
+    def __len__(self):
+        return len(self.items)
+
+    def _match(self, word):
+        word = word.strip()
+        if not word:
+            return None, 0, 0
+        compact = "".join(word.split())
+        # 초성만 입력했으면 초성 색인, 아니면 자모 색인
+        if all(ch in _CONSONANTS for ch in compact):
+            prefix_index = self._initials
+            lo, hi = prefix_index.range(compact)
+        else:
+            prefix_index = self._full
+            lo, hi = prefix_index.range(jamo_key(word))
+        return prefix_index, lo, hi
+
+    def search(self, word, page=1, rows=10):
+        """접두어 검색 → (전체 건수, 현재 페이지 항목)"""
+        prefix_index, lo, hi = self._match(word)
+        if prefix_index is None:
+            return 0, []
+        start = lo + (max(page, 1) - 1) * rows
+        ids = prefix_index.ids[start:min(start + rows, hi)]
+        return hi - lo, [{field: self.items[i].get(field) for field in SEARCH_FIELDS} for i in ids]
+
+    def suggest(self, word, limit=10):
+        """자동완성용 용어명 목록"""
+        prefix_index, lo, hi = self._match(word)
+        if prefix_index is None:
+            return []
+        return [self.items[i]["wordNm"] for i in prefix_index.ids[lo:min(lo + limit, hi)]]
+
+    def detail(self, wordNo):
+        """상세 항목 (설명(wordDc)까지 받아 둔 경우만, 없으면 None)"""
+        item = self._by_no.get(str(wordNo))
+        if item is None or item.get("wordDc") is None:
+            return None
+        return {field: item.get(field) for field in DETAIL_FIELDS}
+
+
+registry.register("farm_dic", "farm_dic.json", build=TermIndex)
+
+
+def get_term_index():
+    """로컬 사전 색인 (farm_dic.json이 없으면 None → 업스트림 사용)"""
+    if not registry.exists("farm_dic"):
+        return None
+    return registry.value("farm_dic")
@@ -1,9 +1,13 @@
 import os
-import requests
-from fastapi import APIRouter, Query
+import httpx
+import asyncio
+from fastapi import APIRouter, Query, HTTPException
 from fastapi.responses import JSONResponse
 from dotenv import load_dotenv
-import xml.etree.ElementTree as ET
+from app.nongsaro.http_client import UpstreamError
+from app.nongsaro.cache import cached_get
+from app.nongsaro.xml_parser import parse_items, first_item
+from app.domain.term.term_index import get_term_index, SEARCH_FIELDS, DETAIL_FIELDS
 
 load_dotenv()
 
@@ -11,8 +15,31 @@ router = APIRouter()
 API_KEY = os.getenv("NONGSARO_TERMS_API_KEY")
 
 
+def _local_index():
+    try:
+        return get_term_index()
+    except Exception as e:
+        print(f"⚠️ 용어 사전 색인 로딩 실패: {e}")
+        return None
+
+
+def _parse_search(content):
+    return parse_items(content, fields=SEARCH_FIELDS, default=None)
+
+
+def _parse_detail(content):
+    return first_item(content, fields=DETAIL_FIELDS, default=None)
+
+
 @router.get("/api/terms/search")
 async def search_terms(word: str = Query(..., description="검색어"), page: int = 1, rows: int = 10):
+    # 로컬 사전 색인이 있으면 메모리에서 접두어 검색 (자모 단위 매칭)
+    # 첫 호출 시 스냅샷 파일을 읽으므로 이벤트 루프 밖에서 로딩
+    index = await asyncio.to_thread(_local_index)
+    if index is not None:
+        total, result = index.search(word, page, rows)
+        return {"results": result, "totalCount": total}
+
     url = "http://api.nongsaro.go.kr/service/farmDic/searchFrontMatch"
     params = {
         "apiKey": API_KEY,
@@ -21,28 +48,23 @@ async def search_terms(word: str = Query(..., description="검색어"), page: in
         "numOfRows": rows
     }
 
-    response = requests.get(url, params=params)
-    if response.status_code != 200:
+    try:
+        result = await cached_get("term_search", url, params, _parse_search)
+    except httpx.HTTPError:
+        return JSONResponse(status_code=502, content={"error": "API 요청 실패"})
+    except UpstreamError:
         return JSONResponse(status_code=500, content={"error": "API 요청 실패"})
 
-    root = ET.fromstring(response.content)
-    items = root.findall(".//item")
-
-    result = []
-    for item in items:
-        result.append({
-            "wordNm": item.findtext("wordNm"),
-            "langNm": item.findtext("langNm"),
-            "wordNo": item.findtext("wordNo"),
-            "wordType": item.findtext("wordType"),
-            "faoCode": item.findtext("faoCode")
-        })
-
     return {"results": result}
 
 
 @router.get("/api/terms/detail")
 async def get_term_detail(wordNo: str = Query(...)):
+    index = await asyncio.to_thread(_local_index)
+    item = index.detail(wordNo) if index is not None else None
+    if item is not None:
+        return {"detail": item}
+
     url = "http://api.nongsaro.go.kr/service/farmDic/detailWord"
     params = {
         "apiKey": API_KEY,
@@ -50,27 +72,20 @@ async def get_term_detail(wordNo: str = Query(...)):
     }
 
     try:
-        response = requests.get(url, params=params)
-        print("상세 응답 확인:", response.content.decode("utf-8")) 
-        if response.status_code != 200:
-            return JSONResponse(status_code=500, content={"error": "상세 조회 실패"})
-
-        root = ET.fromstring(response.content)
-        item = root.find(".//item")
-        if item is None:
-            return {"detail": None}
-
-        return {
-            "detail": {
-                "wordNm": item.findtext("wordNm"),
-                "wordNo": item.findtext("wordNo"),
-                "langNm": item.findtext("langNm"),
-                "wordDc": item.findtext("wordDc"),
-                "faoCode": item.findtext("faoCode"),
-                "wordType": item.findtext("wordType")
-            }
-        }
+        item = await cached_get("term_detail", url, params, _parse_detail)
+        return {"detail": item}
 
+    except UpstreamError:
+        return JSONResponse(status_code=500, content={"error": "상세 조회 실패"})
     except Exception as e:
         print("상세조회 오류:", e)
         return JSONResponse(status_code=500, content={"error": "서버 오류"})
+
+
+@router.get("/api/terms/suggest")
+def suggest_terms(q: str = Query(..., description="입력 중인 검색어 (초성만 입력 가능)"), limit: int = Query(10, ge=1, le=50)):
+    """자동완성 (로컬 사전 색인 필요)"""
+    index = _local_index()
+    if index is None:
+        raise HTTPException(status_code=503, detail="용어 사전 색인이 없습니다. import_farm_dic을 먼저 실행하세요.")
+    return {"suggestions": index.suggest(q, limit)}
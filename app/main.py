@@ -22,6 +22,7 @@ from app.domain.favorite2.favorite2_model import Favorite2
 
 from app.domain.agriPurchase.agri_purchase_router import router as agri_purchase_router
 from app.domain.agriPurchase.agripurchase_dropdown_router import router as dropdown_router
+from app.domain.agriPurchase.agri_purchase_analytics_router import router as agri_purchase_analytics_router
 from app.domain.agriSafety.agri_safety_router import router as agri_safety_router
 from app.domain.agriSafety.agri_accident_router import router as agri_accident_router
 from app.domain.agriSafety.quiz_router import router as quiz_router
@@ -29,12 +30,34 @@ from app.domain.favorite.favorite_router import router as favorite_router
 from app.domain.favorite2.favorite2_router import router as favorite2_router
 from app.rag.agri_rental_rag_chat import router as agri_rental_rag_chat
 from app.domain.term import term_router
+from app.snapshot.snapshot_router import router as snapshot_router
+from app.nongsaro.nongsaro_router import router as nongsaro_router
+from app.nongsaro.http_client import close_client
+from app.domain.agriSafety.safety_mirror import run_sync_loop, SYNC_INTERVAL
 
 
 import os
 import time
+import asyncio
+import contextlib
+from contextlib import asynccontextmanager
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 안전지침/사고사례 로컬 미러 백그라운드 동기화
+    sync_task = asyncio.create_task(run_sync_loop()) if SYNC_INTERVAL > 0 else None
+    yield
+    if sync_task is not None:
+        sync_task.cancel()
+        # 진행 중인 요청/SQLite 쓰기가 정리될 때까지 기다린 뒤 클라이언트를 닫음
+        with contextlib.suppress(asyncio.CancelledError):
+            await sync_task
+    # 종료 시 농사로 API 연결 풀 정리
+    await close_client()
+
+
+app = FastAPI(lifespan=lifespan)
 
 session_chat_histories: Dict[str, List[Dict[str, str]]] = {}
 
@@ -53,6 +76,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Total-Count", "X-Next-Cursor"],
 )
 
 Base.metadata.create_all(bind=engine)
@@ -69,6 +93,7 @@ app.include_router(comment_router)
 app.include_router(rental_router) 
 app.include_router(agri_purchase_router)
 app.include_router(dropdown_router)
+app.include_router(agri_purchase_analytics_router)
 app.include_router(agri_safety_router)
 app.include_router(agri_accident_router)
 app.include_router(quiz_router)
@@ -76,6 +101,8 @@ app.include_router(favorite_router)
 app.include_router(favorite2_router)
 app.include_router(agri_rental_rag_chat)
 app.include_router(term_router.router)
+app.include_router(snapshot_router)
+app.include_router(nongsaro_router)
 
 
 # HTML 렌더링 (React index.html) - 맨 마지막에 위치해야 함 (?????)
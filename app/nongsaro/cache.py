@@ -0,0 +1,190 @@
+import os
+import time
+import asyncio
+from collections import OrderedDict
+from app.nongsaro.http_client import nongsaro_get, UpstreamError
+
+# 전체 캐시 항목 수 상한 (넘으면 가장 오래 안 쓴 항목부터 제거)
+MAX_ENTRIES = int(os.getenv("NONGSARO_CACHE_MAX_ENTRIES", "2000"))
+
+# 만료 후에도 이 시간(초) 동안은 이전 값을 바로 주고 백그라운드에서 갱신
+STALE_SECONDS = float(os.getenv("NONGSARO_CACHE_STALE_SECONDS", "86400"))
+
+# 엔드포인트별 TTL(초) - 농사로 데이터는 길어야 하루 1회 바뀜
+HOUR = 3600
+DEFAULT_TTL = 6 * HOUR
+ENDPOINT_TTLS = {
+    "agri_safety_guide": 6 * HOUR,
+    "agri_safety_guide_all": 6 * HOUR,
+    "agri_accident_list": 6 * HOUR,
+    "agri_accident_detail": 24 * HOUR,
+    "term_search": 24 * HOUR,
+    "term_detail": 24 * HOUR,
+}
+
+
+class _Entry:
+    __slots__ = ("value", "expires_at", "stale_until")
+
+    def __init__(self, value, ttl, stale):
+        now = time.monotonic()
+        self.value = value
+        self.expires_at = now + ttl
+        self.stale_until = self.expires_at + stale
+
+
+class _EndpointStats:
+    __slots__ = ("hits", "stale_hits", "misses", "coalesced", "refreshes", "errors", "fallbacks")
+
+    def __init__(self):
+        self.fallbacks = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.refreshes = 0
+        self.errors = 0
+
+    def as_dict(self):
+        data = {name: getattr(self, name) for name in self.__slots__}
+        served = self.hits + self.stale_hits + self.misses + self.coalesced
+        data["hit_ratio"] = round((self.hits + self.stale_hits) / served, 4) if served else None
+        return data
+
+
+class ResponseCache:
+    """
+    농사로 API 응답 캐시 (이벤트 루프 안에서만 사용)
+    - 키: (엔드포인트, 파라미터), 엔드포인트별 TTL + 전체 LRU 상한
+    - 동시에 들어온 같은 키의 미스는 업스트림 호출 1번으로 합침 (single-flight)
+    - 만료됐지만 stale 구간이면 이전 값을 바로 반환하고 백그라운드에서 갱신
+    - 로딩 실패는 캐시하지 않음, 이전에 받은 값이 남아 있으면 기간이 지났어도 그 값을 반환
+      (업스트림 장애/차단 중에도 마지막 정상 응답 제공), 없으면 예외 그대로 전달
+    """
+
+    def __init__(self, max_entries=MAX_ENTRIES, stale_seconds=STALE_SECONDS, ttls=None):
+        self.max_entries = max_entries
+        self.stale_seconds = stale_seconds
+        self.ttls = dict(ENDPOINT_TTLS if ttls is None else ttls)
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._stats = {}
+
+    @staticmethod
+    def make_key(endpoint, params):
+        # apiKey는 응답 내용과 무관하므로 키에서 제외
+        items = tuple(sorted((k, str(v)) for k, v in (params or {}).items() if k != "apiKey"))
+        return endpoint, items
+
+    def _stat(self, endpoint):
+        stats = self._stats.get(endpoint)
+        if stats is None:
+            stats = self._stats[endpoint] = _EndpointStats()
+        return stats
+
+    async def get(self, endpoint, params, load):
+        """캐시된 값 반환, 없으면 load()를 호출해 채움 (load는 인자 없는 코루틴 함수)"""
+        key = self.make_key(endpoint, params)
+        stats = self._stat(endpoint)
+        now = time.monotonic()
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            if now < entry.expires_at:
+                self._entries.move_to_end(key)
+                stats.hits += 1
+                return entry.value
+            if now < entry.stale_until:
+                self._entries.move_to_end(key)
+                stats.stale_hits += 1
+                if key not in self._inflight:
+                    stats.refreshes += 1
+                    self._start(key, endpoint, load, background=True)
+                return entry.value
+
+        task = self._inflight.get(key)
+        if task is None:
+            stats.misses += 1
+            task = self._start(key, endpoint, load)
+        else:
+            stats.coalesced += 1
+        # 기다리던 요청 하나가 취소돼도 다른 요청이 기다리는 로딩은 계속 진행
+        return await asyncio.shield(task)
+
+    def _start(self, key, endpoint, load, background=False):
+        task = asyncio.ensure_future(self._load(key, endpoint, load, background))
+        # 기다리던 요청이 모두 취소된 경우에도 예외가 처리되지 않은 채 남지 않도록
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        self._inflight[key] = task
+        return task
+
+    async def _load(self, key, endpoint, load, background):
+        try:
+            value = await load()
+        except Exception as e:
+            stats = self._stat(endpoint)
+            stats.errors += 1
+            if background:
+                # 갱신 실패 시 stale 값을 그대로 계속 사용
+                print(f"⚠️ 농사로 캐시 갱신 실패 ({endpoint}): {e}")
+                return None
+            last_good = self._entries.get(key)
+            if last_good is None:
+                raise
+            stats.fallbacks += 1
+            print(f"⚠️ 농사로 API 실패, 마지막 정상 응답 사용 ({endpoint}): {e}")
+            return last_good.value
+        finally:
+            self._inflight.pop(key, None)
+
+        self._entries[key] = _Entry(value, self.ttls.get(endpoint, DEFAULT_TTL), self.stale_seconds)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return value
+
+    def clear(self, endpoint=None):
+        """전체 또는 특정 엔드포인트 항목 삭제, 삭제한 개수 반환"""
+        if endpoint is None:
+            count = len(self._entries)
+            self._entries.clear()
+            return count
+        keys = [key for key in self._entries if key[0] == endpoint]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+    def stats(self):
+        sizes = {}
+        for endpoint, _ in self._entries:
+            sizes[endpoint] = sizes.get(endpoint, 0) + 1
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "inflight": len(self._inflight),
+            "endpoints": {
+                endpoint: dict(stats.as_dict(), size=sizes.get(endpoint, 0), ttl=self.ttls.get(endpoint, DEFAULT_TTL))
+                for endpoint, stats in self._stats.items()
+            },
+        }
+
+
+cache = ResponseCache()
+
+
+async def cached_get(endpoint, url, params, parse):
+    """
+    캐시를 거친 농사로 GET (parse(response.content) 결과를 캐시)
+    - 200이 아니거나 파싱에 실패하면 UpstreamError (캐시하지 않음)
+    - 연결/타임아웃 오류는 httpx 예외 그대로 전달
+    """
+    async def load():
+        response = await nongsaro_get(url, params=params)
+        if response.status_code != 200:
+            raise UpstreamError(f"HTTP {response.status_code}", response.status_code, response.text)
+        try:
+            return parse(response.content)
+        except Exception as e:
+            raise UpstreamError(str(e), response.status_code, response.text)
+
+    return await cache.get(endpoint, params, load)
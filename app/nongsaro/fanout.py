@@ -0,0 +1,37 @@
+import os
+import asyncio
+
+# 한 번의 팬아웃에서 동시에 보내는 업스트림 요청 수 기본값
+FANOUT_CONCURRENCY = int(os.getenv("NONGSARO_FANOUT_CONCURRENCY", "8"))
+
+
+async def iter_fan_out(keys, fetch, limit=FANOUT_CONCURRENCY):
+    """
+    keys마다 fetch(key)를 최대 limit개씩 동시에 실행하고 끝나는 순서대로 (key, 결과) yield
+    - 실패한 key는 결과 자리에 예외 객체를 넘김 (나머지는 계속 진행)
+    - 소비하는 쪽이 중간에 멈추면(클라이언트 연결 종료 등) 남은 요청은 취소
+    """
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def run(key):
+        async with semaphore:
+            try:
+                return key, await fetch(key)
+            except Exception as e:
+                return key, e
+
+    tasks = [asyncio.ensure_future(run(key)) for key in keys]
+    try:
+        for done in asyncio.as_completed(tasks):
+            yield await done
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def fan_out(keys, fetch, limit=FANOUT_CONCURRENCY):
+    """iter_fan_out 결과를 keys 순서대로 모은 dict {key: 결과 또는 예외}"""
+    results = {}
+    async for key, result in iter_fan_out(keys, fetch, limit):
+        results[key] = result
+    return {key: results[key] for key in keys}
@@ -0,0 +1,164 @@
+import os
+import asyncio
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+import time
+import httpx
+from fastapi import HTTPException
+from app.nongsaro.resilience import CircuitBreaker, LatencyTracker, HEDGE_ENABLED, hedged
+
+# 연결/응답 타임아웃 (초)
+CONNECT_TIMEOUT = float(os.getenv("NONGSARO_CONNECT_TIMEOUT", "3.0"))
+READ_TIMEOUT = float(os.getenv("NONGSARO_READ_TIMEOUT", "10.0"))
+
+# 전체 연결 수 / 호스트별 동시 요청 수 / keep-alive 유지 시간
+MAX_CONNECTIONS = int(os.getenv("NONGSARO_MAX_CONNECTIONS", "50"))
+MAX_PER_HOST = int(os.getenv("NONGSARO_MAX_PER_HOST", "10"))
+KEEPALIVE_EXPIRY = float(os.getenv("NONGSARO_KEEPALIVE_EXPIRY", "30.0"))
+
+
+class UpstreamError(Exception):
+    """업스트림 응답을 쓸 수 없음 (200이 아닌 상태 코드, XML 파싱 실패 등)"""
+
+    def __init__(self, message, status_code=None, raw=None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.raw = raw
+
+
+@contextmanager
+def upstream_errors():
+    """
+    라우터용: 블록 안의 업스트림 오류를 502로 변환
+    - httpx.HTTPError → 예외 이름만 응답에 노출
+    - UpstreamError → 업스트림 원문은 서버 로그에만 남김
+    """
+    try:
+        yield
+    except httpx.HTTPError as e:
+        raise HTTPException(status_code=502, detail=f"농사로 API 요청 실패: {type(e).__name__}")
+    except UpstreamError as e:
+        print(f"⚠️ 농사로 API 응답 오류: {e} {(e.raw or '')[:300]}")
+        raise HTTPException(status_code=502, detail="농사로 API 응답 오류")
+
+
+class _HostState:
+    def __init__(self, max_per_host):
+        self.limit = asyncio.Semaphore(max_per_host)
+        self.breaker = CircuitBreaker()
+        self.latency = LatencyTracker()
+
+
+class NongsaroClient:
+    """
+    농사로 등 공공데이터 API 공용 비동기 HTTP 클라이언트
+    - keep-alive 연결 풀 재사용
+    - 호스트별 동시 요청 수 제한 (느린 호스트 하나가 풀 전체를 점유하지 않도록)
+    - 연결/응답 타임아웃 명시 (응답 타임아웃은 호스트별 최근 p99 기준으로 줄어듦)
+    - 호스트별 차단기: 연속 실패 시 일정 시간 요청 없이 즉시 실패 (CircuitOpenError)
+    - 선택적 헤지 요청: p95를 넘기면 같은 GET을 한 번 더 보내 먼저 온 응답 사용
+    """
+
+    def __init__(self, max_connections=MAX_CONNECTIONS, max_per_host=MAX_PER_HOST,
+                 connect_timeout=CONNECT_TIMEOUT, read_timeout=READ_TIMEOUT):
+        self.max_per_host = max_per_host
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self._client = httpx.AsyncClient(
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=KEEPALIVE_EXPIRY,
+            ),
+        )
+        self._hosts = {}
+
+    def _host(self, url):
+        host = urlsplit(url).netloc
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _HostState(self.max_per_host)
+        return state
+
+    async def get(self, url, params=None, timeout=None, hedge=None):
+        """GET 요청 (타임아웃/연결 오류/차단은 httpx 예외로 전달, 5xx는 차단기 실패로 기록)"""
+        host = self._host(url)
+        host.breaker.before_call()
+        if timeout is None:
+            timeout = httpx.Timeout(host.latency.read_timeout(self.read_timeout), connect=self.connect_timeout)
+
+        async def send():
+            async with host.limit:
+                return await self._client.get(url, params=params, timeout=timeout)
+
+        started = time.perf_counter()
+        try:
+            if HEDGE_ENABLED if hedge is None else hedge:
+                response = await hedged(send, host.latency.hedge_delay(), host.latency)
+            else:
+                response = await send()
+        except httpx.HTTPError as e:
+            host.latency.errors += 1
+            if isinstance(e, httpx.TimeoutException):
+                host.latency.timeouts += 1
+            host.breaker.record_failure()
+            raise
+        except asyncio.CancelledError:
+            # 호출한 쪽이 취소한 경우는 업스트림 실패로 보지 않음 (half-open 시험 요청만 풀어 줌)
+            host.breaker.release_probe()
+            raise
+        except Exception:
+            # 그 밖의 예외(잘못된 URL/파라미터 등)도 실패로 기록해 half-open 시험 요청이 묶이지 않도록
+            host.latency.errors += 1
+            host.breaker.record_failure()
+            raise
+
+        host.latency.observe(time.perf_counter() - started)
+        if response.status_code >= 500:
+            host.latency.errors += 1
+            host.breaker.record_failure()
+        else:
+            host.breaker.record_success()
+        return response
+
+    def metrics(self):
+        """호스트별 차단기 상태 + 응답 시간 분위수"""
+        return {
+            host: {"breaker": state.breaker.metrics(), "latency": state.latency.metrics(self.read_timeout)}
+            for host, state in self._hosts.items()
+        }
+
+    @property
+    def is_closed(self):
+        return self._client.is_closed
+
+    async def aclose(self):
+        await self._client.aclose()
+
+
+_client = None
+
+
+def get_client():
+    """앱 전체에서 공유하는 클라이언트 (첫 사용 시 생성)"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = NongsaroClient()
+    return _client
+
+
+async def nongsaro_get(url, params=None, timeout=None, hedge=None):
+    return await get_client().get(url, params=params, timeout=timeout, hedge=hedge)
+
+
+def upstream_metrics():
+    return get_client().metrics()
+
+
+async def close_client():
+    """앱 종료 시 연결 풀 정리 (lifespan에서 호출)"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -0,0 +1,28 @@
+from fastapi import APIRouter, Query, Depends
+from app.nongsaro.cache import cache
+from app.nongsaro.http_client import upstream_metrics
+from app.domain.user.user_router import get_current_user
+
+router = APIRouter(prefix="/api/nongsaro", tags=["Nongsaro"])
+
+# 캐시/차단기 상태는 이벤트 루프 안에서만 다루므로 모두 async 핸들러로 둠 (스레드풀에서 돌리지 않음)
+
+
+@router.get("/cache")
+async def get_cache_stats():
+    """엔드포인트별 적중/미스/합쳐진 요청 수, 항목 수"""
+    return cache.stats()
+
+
+@router.delete("/cache")
+async def clear_cache(
+    endpoint: str = Query(None, description="엔드포인트 이름 (없으면 전체)"),
+    current_user=Depends(get_current_user),
+):
+    return {"cleared": cache.clear(endpoint)}
+
+
+@router.get("/upstream")
+async def get_upstream_metrics():
+    """호스트별 차단기 상태(closed/open/half_open)와 응답 시간 분위수"""
+    return {"hosts": upstream_metrics()}
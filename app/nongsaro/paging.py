@@ -0,0 +1,58 @@
+import math
+from app.nongsaro.http_client import nongsaro_get, UpstreamError
+from app.nongsaro.fanout import fan_out, FANOUT_CONCURRENCY
+from app.nongsaro.xml_parser import parse_items
+
+PAGE_SIZE = 100
+
+
+async def _fetch_page(url, params, page_no, page_size, fields):
+    meta = {}
+    response = await nongsaro_get(url, params={**params, "pageNo": page_no, "numOfRows": page_size})
+    if response.status_code != 200:
+        raise UpstreamError(f"HTTP {response.status_code} ({page_no}페이지)", response.status_code, response.text)
+    try:
+        items = parse_items(response.content, fields=fields, meta=meta)
+    except Exception as e:
+        raise UpstreamError(f"{page_no}페이지 파싱 실패: {e}", response.status_code, response.text)
+    if meta.get("resultCode") not in (None, "", "00"):
+        raise UpstreamError(f"농사로 API 오류: {meta.get('resultCode')} {meta.get('resultMsg', '')}",
+                            response.status_code, response.text)
+    return meta.get("totalCount"), items
+
+
+async def fetch_all_pages(url, params=None, fields=None, key="cntntsNo",
+                          page_size=PAGE_SIZE, concurrency=FANOUT_CONCURRENCY):
+    """
+    목록 API 전체 페이지 수집
+    - 1페이지의 totalCount로 남은 페이지 수를 구해 나머지는 동시에 요청
+    - 페이지 순서대로 합치고 key(cntntsNo) 기준 중복 제거 (페이지 사이에 목록이 밀린 경우 대비)
+    - 한 페이지라도 실패하면 UpstreamError / httpx 예외 (일부만 모은 목록은 반환하지 않음)
+    """
+    params = dict(params or {})
+    total, first = await _fetch_page(url, params, 1, page_size, fields)
+    pages = [first]
+
+    total_pages = math.ceil((total or 0) / page_size)
+    if first and total_pages > 1:
+        results = await fan_out(
+            list(range(2, total_pages + 1)),
+            lambda page_no: _fetch_page(url, params, page_no, page_size, fields),
+            concurrency,
+        )
+        for page_no, result in results.items():
+            if isinstance(result, Exception):
+                raise result
+            pages.append(result[1])
+
+    items = []
+    seen = set()
+    for page in pages:
+        for item in page:
+            value = item.get(key) if key else None
+            if value:
+                if value in seen:
+                    continue
+                seen.add(value)
+            items.append(item)
+    return items
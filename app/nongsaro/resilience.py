@@ -0,0 +1,170 @@
+import os
+import time
+import asyncio
+from collections import deque
+import httpx
+
+# 연속 실패가 이 횟수에 도달하면 차단(open)
+BREAKER_FAILURES = int(os.getenv("NONGSARO_BREAKER_FAILURES", "5"))
+# 차단 후 시험 요청(half-open)을 보내기까지 대기 시간(초)
+BREAKER_RESET_SECONDS = float(os.getenv("NONGSARO_BREAKER_RESET_SECONDS", "30"))
+
+# 응답 시간 기반 타임아웃: p99 * 배수를 [최소, 최대] 범위로 (표본이 적으면 최대값 사용)
+TIMEOUT_MULTIPLIER = float(os.getenv("NONGSARO_TIMEOUT_MULTIPLIER", "4"))
+MIN_READ_TIMEOUT = float(os.getenv("NONGSARO_MIN_READ_TIMEOUT", "2.0"))
+MIN_SAMPLES = 20
+LATENCY_WINDOW = 256
+
+# 헤지 요청: 첫 요청이 p95를 넘기면 같은 GET을 한 번 더 보내고 먼저 온 응답 사용
+HEDGE_ENABLED = os.getenv("NONGSARO_HEDGE", "0") == "1"
+DEFAULT_HEDGE_DELAY = 1.0
+MIN_HEDGE_DELAY = 0.2
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(httpx.HTTPError):
+    """차단 상태라 업스트림에 요청하지 않고 바로 실패"""
+
+
+class CircuitBreaker:
+    """
+    호스트 단위 차단기
+    - closed: 정상, 연속 실패 수를 셈
+    - open: reset 시간 동안 요청하지 않고 즉시 CircuitOpenError
+    - half_open: 시험 요청 1건만 통과시켜 성공하면 closed, 실패하면 다시 open
+    """
+
+    def __init__(self, failures=BREAKER_FAILURES, reset_seconds=BREAKER_RESET_SECONDS):
+        self.failure_threshold = failures
+        self.reset_seconds = reset_seconds
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.open_count = 0
+        self.rejected = 0
+        self._probing = False
+
+    def before_call(self):
+        if self.state == OPEN:
+            if time.monotonic() - self.opened_at < self.reset_seconds:
+                self.rejected += 1
+                raise CircuitOpenError("업스트림 차단 중 (circuit open)")
+            self.state = HALF_OPEN
+        if self.state == HALF_OPEN:
+            if self._probing:
+                self.rejected += 1
+                raise CircuitOpenError("업스트림 복구 확인 중 (circuit half-open)")
+            self._probing = True
+
+    def release_probe(self):
+        """시험 요청이 결과 없이 취소된 경우 다음 요청이 다시 시험할 수 있도록"""
+        self._probing = False
+
+    def record_success(self):
+        self.state = CLOSED
+        self.failures = 0
+        self._probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        self._probing = False
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != OPEN:
+                self.open_count += 1
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+
+    def metrics(self):
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "open_count": self.open_count,
+            "rejected": self.rejected,
+            "opened_seconds_ago": round(time.monotonic() - self.opened_at, 1) if self.state != CLOSED else None,
+        }
+
+
+class LatencyTracker:
+    """최근 응답 시간 표본으로 분위수 계산 (타임아웃/헤지 기준)"""
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self._quantiles = None
+
+    def observe(self, seconds):
+        self.samples.append(seconds)
+        self.count += 1
+        # 매 요청마다 정렬하지 않도록 일정 간격으로만 다시 계산
+        if self.count % 16 == 0 or len(self.samples) <= MIN_SAMPLES:
+            self._quantiles = None
+
+    def quantile(self, q):
+        if len(self.samples) < MIN_SAMPLES:
+            return None
+        if self._quantiles is None:
+            ordered = sorted(self.samples)
+            last = len(ordered) - 1
+            self._quantiles = {p: ordered[min(last, int(p * len(ordered)))] for p in (0.5, 0.95, 0.99)}
+        return self._quantiles[q]
+
+    def read_timeout(self, ceiling):
+        p99 = self.quantile(0.99)
+        if p99 is None:
+            return ceiling
+        return min(ceiling, max(MIN_READ_TIMEOUT, p99 * TIMEOUT_MULTIPLIER))
+
+    def hedge_delay(self):
+        p95 = self.quantile(0.95)
+        return DEFAULT_HEDGE_DELAY if p95 is None else max(MIN_HEDGE_DELAY, p95)
+
+    def metrics(self, ceiling):
+        def ms(value):
+            return round(value * 1000, 1) if value is not None else None
+
+        return {
+            "requests": self.count,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "p50_ms": ms(self.quantile(0.5)),
+            "p95_ms": ms(self.quantile(0.95)),
+            "p99_ms": ms(self.quantile(0.99)),
+            "read_timeout_ms": ms(self.read_timeout(ceiling)),
+        }
+
+
+async def hedged(send, delay, tracker):
+    """
+    send()를 실행하고 delay 안에 끝나지 않으면 한 번 더 실행, 먼저 성공한 응답 반환
+    (둘 다 실패하면 마지막 예외, 남은 요청은 취소)
+    """
+    first = asyncio.ensure_future(send())
+    tasks = {first}
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if not done:
+            tasks.add(asyncio.ensure_future(send()))
+            tracker.hedged += 1
+
+        error = None
+        while tasks:
+            done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is not first:
+                        tracker.hedge_wins += 1
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in tasks:
+            task.cancel()
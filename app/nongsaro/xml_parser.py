@@ -0,0 +1,83 @@
+import io
+import html
+import xml.etree.ElementTree as ET
+
+# <items> 밖에 있는 값 중 meta로 모아 두는 태그 (header/body 공통)
+META_TAGS = ("resultCode", "resultMsg", "totalCount", "pageNo", "numOfRows")
+
+
+def _to_stream(source):
+    if isinstance(source, str):
+        return io.BytesIO(source.encode("utf-8"))
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    return source
+
+
+def _convert(value, converter):
+    try:
+        return converter(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def iter_items(source, fields=None, types=None, default="", unescape=False, meta=None, item_tag="item"):
+    """
+    농사로 API 응답 XML에서 <item>을 하나씩 dict로 변환해 yield (iterparse 기반)
+    - source: bytes / str / 파일 객체 (httpx/requests 응답 본문 그대로)
+    - fields: 꺼낼 태그 목록 (없는 태그는 default), None이면 모든 하위 태그
+    - types: {태그: 변환 함수} (예: {"totalCount": int}), 변환 실패 시 None
+    - unescape: HTML 엔티티(&amp; 등) 해제
+    - meta: dict를 넘기면 totalCount, resultCode 등 <item> 밖의 값을 채워 줌
+    처리한 <item>은 바로 트리에서 떼어내므로 전체 DOM을 메모리에 들고 있지 않음
+    """
+    types = types or {}
+    stack = []
+    depth_in_item = 0
+
+    for event, elem in ET.iterparse(_to_stream(source), events=("start", "end")):
+        if event == "start":
+            stack.append(elem)
+            if elem.tag == item_tag or depth_in_item:
+                depth_in_item += 1
+            continue
+
+        stack.pop()
+        if depth_in_item:
+            depth_in_item -= 1
+            if elem.tag != item_tag or depth_in_item:
+                continue
+
+            values = {}
+            for child in elem:
+                text = child.text.strip() if child.text else ""
+                if unescape and text:
+                    text = html.unescape(text)
+                values[child.tag] = text
+
+            if fields is None:
+                item = values
+            else:
+                item = {field: values.get(field, default) for field in fields}
+            for field, converter in types.items():
+                if field in item:
+                    item[field] = _convert(item[field], converter)
+
+            elem.clear()
+            if stack:
+                stack[-1].remove(elem)
+            yield item
+
+        elif meta is not None and elem.tag in META_TAGS:
+            text = elem.text.strip() if elem.text else ""
+            meta[elem.tag] = _convert(text, int) if elem.tag in ("totalCount", "pageNo", "numOfRows") else text
+
+
+def parse_items(source, **kwargs):
+    """iter_items 결과를 리스트로 반환"""
+    return list(iter_items(source, **kwargs))
+
+
+def first_item(source, **kwargs):
+    """첫 번째 <item>만 반환 (없으면 None) - 상세 조회용"""
+    return next(iter_items(source, **kwargs), None)
@@ -0,0 +1,69 @@
+"""
+xml_parser 벤치마크: 기존 방식(ET.fromstring + findall) vs iter_items(iterparse)
+실행: python -m app.nongsaro.xml_parser_bench --rows 5000
+"""
+import time
+import argparse
+import tracemalloc
+import xml.etree.ElementTree as ET
+from app.nongsaro.xml_parser import iter_items
+
+
+def make_xml(rows):
+    item = (
+        "<item><cntntsNo>{i}</cntntsNo><cntntsSj>농기계 안전사고 사례 {i}</cntntsSj>"
+        "<knmcCodeNm>트랙터</knmcCodeNm><safeAcdntSeCodeNm>전도</safeAcdntSeCodeNm>"
+        "<cn>" + "작업 중 경사지에서 트랙터가 전도되어 운전자가 부상을 입었다. " * 20 + "</cn></item>"
+    )
+    items = "".join(item.format(i=i) for i in range(rows))
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?><response><header><resultCode>00</resultCode></header>'
+        f"<body><items>{items}</items><numOfRows>{rows}</numOfRows><pageNo>1</pageNo>"
+        f"<totalCount>{rows}</totalCount></body></response>"
+    ).encode("utf-8")
+
+
+def dom_count(content):
+    root = ET.fromstring(content)
+    count = 0
+    for item_elem in root.findall(".//item"):
+        {child.tag: child.text.strip() if child.text else "" for child in item_elem}
+        count += 1
+    return count
+
+
+def stream_count(content):
+    count = 0
+    for _ in iter_items(content):
+        count += 1
+    return count
+
+
+def measure(func, content, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        count = func(content)
+    elapsed = (time.perf_counter() - started) / repeat
+
+    tracemalloc.start()
+    func(content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return count, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    content = make_xml(args.rows)
+    print(f"입력 크기: {len(content) / 1024 / 1024:.1f} MB, item {args.rows}개")
+    for name, func in (("ET.fromstring", dom_count), ("iter_items", stream_count)):
+        count, elapsed, peak = measure(func, content, args.repeat)
+        print(f"{name:14s} {count / elapsed:10.0f} items/s  {elapsed * 1000:8.1f} ms  peak {peak / 1024 / 1024:6.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
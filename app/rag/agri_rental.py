@@ -1,97 +1,52 @@
 import os
+import chromadb
 from dotenv import load_dotenv
-from langchain_community.document_loaders import PDFPlumberLoader
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain_openai import OpenAIEmbeddings
-from langchain_community.vectorstores import Chroma
+from app.rag.ingest import PageCache, ingest
 
 
 load_dotenv()
 api_key = os.getenv("OPENAI_API_KEY")
 
 
+# ✅ 벡터 DB에 넣을 원본 문서 (PDF / Markdown, 없는 파일은 건너뜀)
+# Markdown은 같은 지침을 변환한 것이라 함께 넣으면 모든 내용이 두 번 들어감 → 기본은 PDF만
 pdf_path = "app/data/2025년 농기계임대 사업시행지침.pdf"
-persist_directory = "chroma_data_agri_rental"
-
-
-def save_documents():
-    print("✅ PDF 문서 로딩 중...")
-    loader = PDFPlumberLoader(pdf_path)
-    pages = loader.load()
-
-    print(f"✅ 총 페이지 수: {len(pages)}")
-    splitter = RecursiveCharacterTextSplitter(chunk_size=600, chunk_overlap=100)
-    documents = splitter.split_documents(pages)
+md_path = "app/data/2025_농기계임대_사업시행지침.md"
+# RAG_SOURCES: 경로 목록 (os.pathsep 구분, 예: RAG_SOURCES="app/data/a.pdf:app/data/b.pdf")
+sources = [path for path in os.getenv("RAG_SOURCES", pdf_path).split(os.pathsep) if path.strip()]
 
-    print(f"✅ 분할된 문서 수: {len(documents)}")
+persist_directory = "chroma_data_agri_rental"
+# LangChain Chroma 기본 컬렉션 (챗봇이 읽는 컬렉션과 같아야 함)
+collection_name = "langchain"
+# 파일 해시별 페이지 텍스트 캐시 (벡터 DB 디렉터리와 분리)
+page_cache_directory = "chroma_data_agri_rental_pages"
+
+
+def save_documents(paths=None, prune=True):
+    """
+    원본 문서 → 벡터 DB 증분 반영 (paths가 없으면 sources)
+    바뀐 청크만 다시 임베딩하므로 지침 일부 개정 시 몇 초 안에 끝남
+    """
+    print("✅ 문서 로딩/분할 중...")
     embedding = OpenAIEmbeddings(api_key=api_key)
-    vectorstore = Chroma.from_documents(
-        documents=documents,
-        embedding=embedding,
-        persist_directory=persist_directory
+    # 임베딩은 직접 계산해서 넘기므로 컬렉션 기본 임베딩 함수는 쓰지 않음
+    client = chromadb.PersistentClient(path=persist_directory)
+    collection = client.get_or_create_collection(collection_name, embedding_function=None)
+    splitter = RecursiveCharacterTextSplitter(chunk_size=600, chunk_overlap=100)
+    report = ingest(
+        paths or sources,
+        collection,
+        embedding,
+        splitter,
+        PageCache(page_cache_directory),
+        prune=prune,
     )
-    vectorstore.persist()
-    print("🎉 벡터 DB 저장 완료! → chroma_data_agri_rental")
+    print(f"🎉 벡터 DB 반영 완료! → {persist_directory} ({report['took_ms']}ms)")
+    return report
 
 
 # ✅ 1회 실행용
 # if __name__ == "__main__":
 #     save_documents()
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-# # app/rag/agri_rental.py
-
-# import os
-# from dotenv import load_dotenv
-# from langchain_community.document_loaders import TextLoader  # ✅ Markdown 로더
-# from langchain.text_splitter import RecursiveCharacterTextSplitter
-# from langchain_openai import OpenAIEmbeddings
-# from langchain_community.vectorstores import Chroma
-
-# # ✅ 환경 변수 로드
-# load_dotenv()
-# api_key = os.getenv("OPENAI_API_KEY")
-
-# # ✅ Markdown 파일 및 벡터 저장 경로 설정
-# md_path = "app/data/2025_농기계임대_사업시행지침.md"  # ✅ 변경된 경로
-# persist_directory = "chroma_data_agri_rental"
-
-# # ✅ 벡터 저장 함수
-# def save_documents():
-#     print("✅ Markdown 문서 로딩 중...")
-#     loader = TextLoader(md_path, encoding="utf-8")  # ✅ TextLoader로 로딩
-#     pages = loader.load()
-
-#     print(f"✅ 불러온 문서 수: {len(pages)}")  # 보통 1개로 나옴
-#     splitter = RecursiveCharacterTextSplitter(chunk_size=600, chunk_overlap=100)
-#     documents = splitter.split_documents(pages)
-
-#     print(f"✅ 분할된 문서 수: {len(documents)}")
-#     embedding = OpenAIEmbeddings(api_key=api_key)
-#     vectorstore = Chroma.from_documents(
-#         documents=documents,
-#         embedding=embedding,
-#         persist_directory=persist_directory
-#     )
-#     vectorstore.persist()
-#     print("🎉 벡터 DB 저장 완료! → chroma_data_agri_rental")
-
-# # ✅ 실행
-# # if __name__ == "__main__":
-# #     save_documents()
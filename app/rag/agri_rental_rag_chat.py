@@ -1,12 +1,19 @@
 import os
+import json
+import time
+import asyncio
 from dotenv import load_dotenv
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from langchain.chains import RetrievalQA
 from langchain.chat_models import ChatOpenAI
 from langchain_community.vectorstores import Chroma
 from langchain.prompts import PromptTemplate
 from langchain_openai import OpenAIEmbeddings
+from langchain_core.documents import Document
+from app.rag.answer_cache import AnswerCache
+from app.rag.bm25 import ChromaBM25, rrf_fuse
+from app.rag.context import assemble_context, count_tokens
 
 
 load_dotenv()
@@ -14,6 +21,15 @@ api_key = os.getenv("OPENAI_API_KEY")
 
 router = APIRouter()
 
+# 검색 방식: vector(임베딩 유사도) / bm25(글자 n-gram 키워드) / hybrid(두 결과를 RRF로 합침)
+RETRIEVAL_MODE = os.getenv("RAG_RETRIEVAL_MODE", "hybrid")
+if RETRIEVAL_MODE not in ("vector", "bm25", "hybrid"):
+    raise ValueError(f"RAG_RETRIEVAL_MODE는 vector/bm25/hybrid 중 하나여야 합니다: {RETRIEVAL_MODE}")
+
+# 프롬프트에 넣을 청크 수 / hybrid에서 방식별로 먼저 가져올 후보 수
+RETRIEVAL_K = int(os.getenv("RAG_RETRIEVAL_K", "6"))
+CANDIDATE_K = int(os.getenv("RAG_CANDIDATE_K", "20"))
+
 class QueryRequest(BaseModel):
     query: str
 
@@ -50,38 +66,180 @@ prompt = PromptTemplate(
 )
 
 
+CHROMA_DIR = "chroma_data_agri_rental"
+
 embedding = OpenAIEmbeddings(api_key=api_key)
 vectorstore = Chroma(
-    persist_directory="chroma_data_agri_rental",
+    persist_directory=CHROMA_DIR,
     embedding_function=embedding
 )
 
-
-qa = RetrievalQA.from_chain_type(
-    llm=ChatOpenAI(api_key=api_key, temperature=0.1, model="gpt-4o-mini"),  # 약간의 창의성 허용
-    chain_type="stuff",
-    retriever=vectorstore.as_retriever(
-        search_type="similarity",  
-        search_kwargs={"k": 12}  
-    ),
-    chain_type_kwargs={"prompt": prompt}
-)
+# 조항 번호/사업명 같은 정확한 용어 검색용 키워드 색인 (벡터 DB와 같은 청크)
+lexical_index = ChromaBM25(vectorstore, CHROMA_DIR)
+
+# 같은/비슷한 질문은 임베딩·LLM 호출 없이 응답 (벡터 DB가 바뀌면 자동 무효화, SQLite 입출력은 스레드에서)
+answer_cache = AnswerCache(CHROMA_DIR)
+
+
+llm = ChatOpenAI(api_key=api_key, temperature=0.1, model="gpt-4o-mini", streaming=True)  # 약간의 창의성 허용
+
+
+def _elapsed_ms(started):
+    return round((time.perf_counter() - started) * 1000, 1)
+
+
+async def embed(query, timings):
+    started = time.perf_counter()
+    query_vector = await embedding.aembed_query(query)
+    timings["embed_ms"] = _elapsed_ms(started)
+    return query_vector
+
+
+def _vector_search(query_vector, k):
+    docs = vectorstore.similarity_search_by_vector(query_vector, k)
+    return [(doc.page_content, doc.metadata) for doc in docs]
+
+
+def _bm25_search(query, k):
+    return lexical_index.get().search(query, k)
+
+
+async def retrieve(query, query_vector, timings):
+    """
+    RETRIEVAL_MODE에 따라 청크 검색 (동기 검색은 스레드에서 실행해 이벤트 루프를 막지 않음)
+    hybrid: 벡터/BM25 후보를 동시에 가져와 RRF로 합친 뒤 상위 RETRIEVAL_K개
+    """
+    started = time.perf_counter()
+    if RETRIEVAL_MODE == "vector":
+        hits = await asyncio.to_thread(_vector_search, query_vector, RETRIEVAL_K)
+    elif RETRIEVAL_MODE == "bm25":
+        hits = await asyncio.to_thread(_bm25_search, query, RETRIEVAL_K)
+    else:
+        vector_hits, bm25_hits = await asyncio.gather(
+            asyncio.to_thread(_vector_search, query_vector, CANDIDATE_K),
+            asyncio.to_thread(_bm25_search, query, CANDIDATE_K),
+        )
+        hits = rrf_fuse([vector_hits, bm25_hits], RETRIEVAL_K)
+    timings["retrieve_ms"] = _elapsed_ms(started)
+    timings["retrieval_mode"] = RETRIEVAL_MODE
+    return [Document(page_content=text, metadata=metadata) for text, metadata in hits]
+
+
+async def generate(query, docs, timings, usage):
+    """검색된 문서를 토큰 예산에 맞게 정리해 프롬프트를 채우고 답변을 토큰 단위로 yield"""
+    started = time.perf_counter()
+    context, stats = assemble_context(query, docs)
+    text = prompt.format(context=context, question=query)
+    usage.update(stats)
+    usage["prompt_tokens"] = count_tokens(text)
+    timings["context_ms"] = _elapsed_ms(started)
+
+    started = time.perf_counter()
+    first = True
+    async for chunk in llm.astream(text):
+        if not chunk.content:
+            continue
+        if first:
+            timings["first_token_ms"] = _elapsed_ms(started)
+            first = False
+        yield chunk.content
+    timings["generate_ms"] = _elapsed_ms(started)
+
+
+async def answer_stream(query, timings, usage):
+    """
+    캐시 확인 + 검색 + 생성 전체 (토큰 단위)
+    캐시에 있으면 답변 전체를 한 번에 yield하고 timings["cache"]에 "exact"/"semantic" 기록
+    usage에는 프롬프트 토큰 수/문서 내용 청크 수 기록 (캐시 적중이면 비어 있음)
+    끝까지 생성된 답변만 캐시에 저장 (중간에 끊긴 답변은 저장하지 않음)
+    """
+    started = time.perf_counter()
+    cached = await asyncio.to_thread(answer_cache.lookup_exact, query)
+    if cached is None:
+        query_vector = await embed(query, timings)
+        cached = await asyncio.to_thread(answer_cache.lookup_similar, query_vector)
+        hit = "semantic"
+    else:
+        hit = "exact"
+
+    if cached is not None:
+        timings["cache"] = hit
+        timings["total_ms"] = _elapsed_ms(started)
+        yield cached
+        return
+
+    timings["cache"] = "miss"
+    docs = await retrieve(query, query_vector, timings)
+    tokens = []
+    async for token in generate(query, docs, timings, usage):
+        tokens.append(token)
+        yield token
+    timings["total_ms"] = _elapsed_ms(started)
+    await asyncio.to_thread(answer_cache.store, query, query_vector, "".join(tokens))
+
+
+def _sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
 
 
 @router.post("/api/rag/agri-rental/query")
 async def query_agri_rental_chatbot(request: QueryRequest):
+    timings, usage = {}, {}
     try:
-        result = qa.run(request.query)
-        return {"response": result}
+        result = "".join([token async for token in answer_stream(request.query, timings, usage)])
+        return {"response": result, "timings": timings, "usage": usage}
     except Exception as e:
         return {"response": f"죄송합니다. 답변 처리 중 오류가 발생했습니다: {str(e)}"}
 
+
+@router.post("/api/rag/agri-rental/query/stream")
+async def stream_agri_rental_chatbot(request: QueryRequest, http_request: Request):
+    """
+    SSE 스트리밍 답변
+    - event: token  → {"text": 토큰}
+    - event: done   → {"timings": 단계별 소요 시간(ms), "usage": 프롬프트 토큰 수 등}
+    - event: error  → {"message": 오류 메시지}
+    클라이언트 연결이 끊기면 생성을 중단 (OpenAI 스트림도 함께 닫힘)
+    """
+    async def events():
+        timings, usage = {}, {}
+        tokens = answer_stream(request.query, timings, usage)
+        try:
+            async for token in tokens:
+                if await http_request.is_disconnected():
+                    print("⚠️ 챗봇 클라이언트 연결 종료 - 답변 생성 중단")
+                    return
+                yield _sse("token", {"text": token})
+            yield _sse("done", {"timings": timings, "usage": usage})
+        except Exception as e:
+            yield _sse("error", {"message": f"죄송합니다. 답변 처리 중 오류가 발생했습니다: {str(e)}"})
+        finally:
+            await tokens.aclose()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.get("/api/rag/agri-rental/cache")
+def get_answer_cache_stats():
+    """답변 캐시 적중률/크기"""
+    return answer_cache.stats()
+
+
+@router.delete("/api/rag/agri-rental/cache")
+def clear_answer_cache():
+    answer_cache.clear()
+    return {"cleared": True}
+
+
 # ✅ 추가: 검색 성능 테스트용 엔드포인트
 @router.post("/api/rag/agri-rental/search-test")
 async def test_search(request: QueryRequest):
     """검색된 문서 내용을 확인하는 디버깅용 엔드포인트"""
     try:
-        docs = vectorstore.similarity_search(request.query, k=5)
+        docs = await asyncio.to_thread(vectorstore.similarity_search, request.query, 5)
         results = []
         for i, doc in enumerate(docs):
             results.append({
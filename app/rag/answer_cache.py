@@ -0,0 +1,247 @@
+import os
+import re
+import time
+import sqlite3
+import hashlib
+import threading
+import unicodedata
+from collections import OrderedDict
+from contextlib import contextmanager
+import numpy as np
+
+DB_FILE = os.getenv(
+    "RAG_ANSWER_CACHE_DB",
+    os.path.join(os.path.dirname(__file__), "..", "data", "rag_answer_cache.db"),
+)
+
+# 캐시 유효 시간(초) / 최대 개수 / 의미 유사 판정 기준(코사인 유사도)
+TTL_SECONDS = float(os.getenv("RAG_ANSWER_CACHE_TTL", str(7 * 24 * 3600)))
+MAX_ENTRIES = int(os.getenv("RAG_ANSWER_CACHE_MAX", "1000"))
+SIMILARITY_THRESHOLD = float(os.getenv("RAG_ANSWER_CACHE_THRESHOLD", "0.95"))
+
+# 벡터 DB 변경 여부(파일 stat)를 다시 확인하기까지의 최소 간격(초)
+FINGERPRINT_CHECK_INTERVAL = 30.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS answer (
+    key TEXT PRIMARY KEY,
+    query TEXT NOT NULL,
+    vector BLOB NOT NULL,
+    response TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    used_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+_IGNORED = re.compile(r"[\s\W_]+")
+
+
+def normalize_query(query):
+    """전각/반각 통일, 소문자, 띄어쓰기·문장부호 제거 ('임대료는 얼마?' == '임대료는얼마')"""
+    return _IGNORED.sub("", unicodedata.normalize("NFKC", query or "").lower())
+
+
+def directory_fingerprint(path):
+    """디렉터리 아래 파일들의 (경로, 크기, mtime) 해시 (Chroma를 다시 만들면 바뀜)"""
+    digest = hashlib.sha256()
+    if not os.path.isdir(path):
+        return ""
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for name in sorted(files):
+            full = os.path.join(root, name)
+            try:
+                stat = os.stat(full)
+            except FileNotFoundError:
+                continue
+            digest.update(f"{os.path.relpath(full, path)}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+
+class AnswerCache:
+    """
+    RAG 답변 캐시 (2단계)
+    1. 정규화한 질문 문자열 완전 일치 → 임베딩 호출 없이 바로 응답
+    2. 질문 임베딩 코사인 유사도가 기준 이상인 기존 질문 → LLM 호출 없이 응답
+    - LRU + TTL로 정리, SQLite에 저장해 재시작 후에도 유지
+    - 벡터 DB 디렉터리 fingerprint가 바뀌면(재색인) 전체 무효화
+    SQLite 입출력과 디렉터리 확인이 있으므로 이벤트 루프에서는 asyncio.to_thread로 호출
+    (공개 메서드는 락으로 직렬화)
+    """
+
+    def __init__(self, source_dir, path=DB_FILE):
+        self.source_dir = source_dir
+        self.path = path
+        self._entries = OrderedDict()  # key → {"query", "vector", "response", "created_at"}
+        self._matrix = None
+        self._matrix_keys = []
+        self._loaded = False
+        self._fingerprint = None
+        self._checked_at = 0.0
+        self._stats = {"exact_hits": 0, "semantic_hits": 0, "misses": 0, "invalidations": 0}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _connect(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            conn.executescript(SCHEMA)
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _ensure_fresh(self):
+        """처음 사용 시 디스크에서 불러오고, 벡터 DB가 바뀌었으면 비움"""
+        now = time.monotonic()
+        if self._loaded and now - self._checked_at < FINGERPRINT_CHECK_INTERVAL:
+            return
+        self._checked_at = now
+        fingerprint = directory_fingerprint(self.source_dir)
+
+        if not self._loaded:
+            self._loaded = True
+            self._fingerprint = fingerprint
+            with self._connect() as conn:
+                row = conn.execute("SELECT value FROM meta WHERE name = 'fingerprint'").fetchone()
+                if row is None or row[0] != fingerprint:
+                    self._reset(conn, fingerprint)
+                    return
+                self._load(conn)
+            return
+
+        if fingerprint != self._fingerprint:
+            print("⚠️ 벡터 DB가 변경되어 RAG 답변 캐시를 비웁니다.")
+            self._stats["invalidations"] += 1
+            self._fingerprint = fingerprint
+            with self._connect() as conn:
+                self._reset(conn, fingerprint)
+
+    def _reset(self, conn, fingerprint):
+        conn.execute("DELETE FROM answer")
+        conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('fingerprint', ?)", (fingerprint,))
+        self._entries.clear()
+        self._matrix = None
+
+    def _load(self, conn):
+        expire_before = time.time() - TTL_SECONDS
+        conn.execute("DELETE FROM answer WHERE created_at < ?", (expire_before,))
+        rows = conn.execute(
+            "SELECT key, query, vector, response, created_at FROM answer ORDER BY used_at DESC LIMIT ?",
+            (MAX_ENTRIES,),
+        ).fetchall()
+        # 오래 안 쓴 것부터 넣어서 OrderedDict 끝이 가장 최근
+        for key, query, vector, response, created_at in reversed(rows):
+            self._entries[key] = {
+                "query": query,
+                "vector": np.frombuffer(vector, dtype=np.float32),
+                "response": response,
+                "created_at": created_at,
+            }
+        self._matrix = None
+
+    def _expired(self, entry):
+        return time.time() - entry["created_at"] > TTL_SECONDS
+
+    def _touch(self, key):
+        self._entries.move_to_end(key)
+        with self._connect() as conn:
+            conn.execute("UPDATE answer SET used_at = ? WHERE key = ?", (time.time(), key))
+
+    def _drop(self, keys):
+        for key in keys:
+            self._entries.pop(key, None)
+        self._matrix = None
+        with self._connect() as conn:
+            conn.executemany("DELETE FROM answer WHERE key = ?", [(key,) for key in keys])
+
+    def lookup_exact(self, query):
+        """정규화 질문 완전 일치 → 답변 / 없으면 None"""
+        with self._lock:
+            self._ensure_fresh()
+            key = normalize_query(query)
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if self._expired(entry):
+                self._drop([key])
+                return None
+            self._touch(key)
+            self._stats["exact_hits"] += 1
+            return entry["response"]
+
+    def lookup_similar(self, query_vector):
+        """질문 임베딩과 가장 비슷한 기존 질문의 답변 (기준 미만이면 None)"""
+        with self._lock:
+            self._ensure_fresh()
+            if not self._entries:
+                self._stats["misses"] += 1
+                return None
+            if self._matrix is None:
+                self._matrix_keys = list(self._entries)
+                self._matrix = np.stack([self._entries[key]["vector"] for key in self._matrix_keys])
+
+            vector = _unit(query_vector)
+            if vector.shape[0] != self._matrix.shape[1]:
+                self._stats["misses"] += 1
+                return None
+            scores = self._matrix @ vector
+            best = int(np.argmax(scores))
+            key = self._matrix_keys[best]
+            entry = self._entries.get(key)
+            if scores[best] < SIMILARITY_THRESHOLD or entry is None or self._expired(entry):
+                self._stats["misses"] += 1
+                return None
+            self._touch(key)
+            self._stats["semantic_hits"] += 1
+            return entry["response"]
+
+    def store(self, query, query_vector, response):
+        with self._lock:
+            self._ensure_fresh()
+            key = normalize_query(query)
+            if not key or not response:
+                return
+            now = time.time()
+            vector = _unit(query_vector)
+            self._entries[key] = {"query": query, "vector": vector, "response": response, "created_at": now}
+            self._entries.move_to_end(key)
+            self._matrix = None
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO answer (key, query, vector, response, created_at, used_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, query, vector.tobytes(), response, now, now),
+                )
+            overflow = len(self._entries) - MAX_ENTRIES
+            if overflow > 0:
+                self._drop(list(self._entries)[:overflow])
+
+    def clear(self):
+        with self._lock:
+            self._ensure_fresh()
+            with self._connect() as conn:
+                self._reset(conn, self._fingerprint)
+
+    def stats(self):
+        with self._lock:
+            self._ensure_fresh()
+            return {
+                **self._stats,
+                "entries": len(self._entries),
+                "max_entries": MAX_ENTRIES,
+                "ttl_seconds": TTL_SECONDS,
+                "threshold": SIMILARITY_THRESHOLD,
+                "fingerprint": self._fingerprint[:16],
+            }
+
+
+def _unit(vector):
+    vector = np.asarray(vector, dtype=np.float32)
+    norm = float(np.linalg.norm(vector))
+    return vector / norm if norm else vector
@@ -0,0 +1,128 @@
+import re
+import time
+import threading
+import unicodedata
+import numpy as np
+from app.rag.answer_cache import directory_fingerprint
+
+# BM25 파라미터
+K1 = 1.2
+B = 0.75
+
+# 한국어는 띄어쓰기/조사가 제각각이라 어절 대신 글자 n-gram으로 색인
+NGRAM_SIZES = (2, 3)
+
+# 벡터 DB 변경 여부를 다시 확인하기까지의 최소 간격(초)
+FINGERPRINT_CHECK_INTERVAL = 30.0
+
+_TOKEN = re.compile(r"\w+")
+
+
+def char_ngrams(text):
+    """어절별 글자 2/3-gram ('제12조의2' → '제1', '12', ... / 한 글자 어절은 그대로)"""
+    grams = []
+    for token in _TOKEN.findall(unicodedata.normalize("NFKC", text or "").lower()):
+        if len(token) == 1:
+            grams.append(token)
+            continue
+        for n in NGRAM_SIZES:
+            grams.extend(token[i:i + n] for i in range(len(token) - n + 1))
+    return grams
+
+
+class BM25Index:
+    """
+    청크 전체에 대한 글자 n-gram BM25 (메모리 색인)
+    - 문서별 BM25 가중치를 (용어 x 문서) CSR 행렬로 미리 계산해 두고
+      질의 용어 행만 더해서 점수 계산
+    """
+
+    def __init__(self, texts, metadatas):
+        from scipy.sparse import csr_matrix
+
+        self.texts = list(texts)
+        self.metadatas = list(metadatas)
+        self.vocab = {}
+        rows, cols, tfs = [], [], []
+        lengths = np.zeros(len(self.texts), dtype=np.float64)
+        for doc, text in enumerate(self.texts):
+            counts = {}
+            for gram in char_ngrams(text):
+                term = self.vocab.setdefault(gram, len(self.vocab))
+                counts[term] = counts.get(term, 0) + 1
+            lengths[doc] = sum(counts.values())
+            rows.extend(counts)
+            cols.extend([doc] * len(counts))
+            tfs.extend(counts.values())
+
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        tfs = np.asarray(tfs, dtype=np.float64)
+        df = np.bincount(rows, minlength=len(self.vocab))
+        idf = np.log(1 + (len(self.texts) - df + 0.5) / (df + 0.5))
+        avg_length = lengths.mean() if len(self.texts) else 0.0
+        norm = K1 * (1 - B + B * lengths[cols] / avg_length) if avg_length else np.full(len(cols), K1)
+        weights = idf[rows] * tfs * (K1 + 1) / (tfs + norm)
+        self.weights = csr_matrix((weights, (rows, cols)), shape=(len(self.vocab), len(self.texts)))
+
+    def __len__(self):
+        return len(self.texts)
+
+    def search(self, query, k):
+        """점수 높은 순 [(본문, 메타데이터)] (질의 용어가 하나도 없는 문서는 제외)"""
+        terms = [self.vocab[gram] for gram in char_ngrams(query) if gram in self.vocab]
+        if not terms or not self.texts:
+            return []
+        term_ids, counts = np.unique(terms, return_counts=True)
+        scores = np.asarray(self.weights[term_ids].T @ counts.astype(np.float64)).ravel()
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k)[:k]]
+        ranked = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [(self.texts[doc], self.metadatas[doc]) for doc in ranked.tolist()]
+
+
+class ChromaBM25:
+    """
+    Chroma 컬렉션과 같은 청크로 만든 BM25 색인
+    벡터 DB 디렉터리 fingerprint가 바뀌면(재색인) 다음 검색 때 다시 만듦
+    """
+
+    def __init__(self, vectorstore, source_dir):
+        self.vectorstore = vectorstore
+        self.source_dir = source_dir
+        self._index = None
+        self._fingerprint = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self):
+        if self._index is not None and time.monotonic() - self._checked_at < FINGERPRINT_CHECK_INTERVAL:
+            return self._index
+        with self._lock:
+            if self._index is not None and time.monotonic() - self._checked_at < FINGERPRINT_CHECK_INTERVAL:
+                return self._index
+            fingerprint = directory_fingerprint(self.source_dir)
+            if self._index is None or fingerprint != self._fingerprint:
+                started = time.perf_counter()
+                data = self.vectorstore.get(include=["documents", "metadatas"])
+                self._index = BM25Index(data["documents"], [m or {} for m in data["metadatas"]])
+                self._fingerprint = fingerprint
+                print(f"✅ BM25 색인 생성: {len(self._index)}청크 ({(time.perf_counter() - started) * 1000:.0f}ms)")
+            self._checked_at = time.monotonic()
+            return self._index
+
+
+def rrf_fuse(rankings, k, constant=60):
+    """
+    Reciprocal Rank Fusion: 여러 순위 목록 [(본문, 메타데이터)]를 합쳐 상위 k개
+    같은 본문이면 같은 청크로 봄
+    """
+    scores = {}
+    items = {}
+    for ranking in rankings:
+        for rank, (text, metadata) in enumerate(ranking):
+            scores[text] = scores.get(text, 0.0) + 1.0 / (constant + rank + 1)
+            items.setdefault(text, (text, metadata))
+    ranked = sorted(scores, key=scores.get, reverse=True)
+    return [items[text] for text in ranked[:k]]
@@ -0,0 +1,126 @@
+import os
+from functools import lru_cache
+from app.rag.bm25 import char_ngrams
+
+# 프롬프트에 넣을 문서 내용의 최대 토큰 수
+CONTEXT_TOKEN_BUDGET = int(os.getenv("RAG_CONTEXT_TOKENS", "2500"))
+TOKEN_MODEL = "gpt-4o-mini"
+
+# 이웃 청크 겹침으로 볼 최소/최대 글자 수 (분할 시 chunk_overlap=100)
+MIN_OVERLAP = 20
+MAX_OVERLAP = 300
+
+# 재정렬 점수 = 질문 n-gram 포함 비율 + RANK_WEIGHT / (검색 순위 + 1)
+RANK_WEIGHT = 0.5
+
+# 예산이 이 토큰 수 이상 남았으면 마지막 조각을 잘라서라도 넣음
+MIN_TRUNCATED_TOKENS = 80
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    import tiktoken
+
+    try:
+        return tiktoken.encoding_for_model(TOKEN_MODEL)
+    except Exception as e:
+        # 인코딩 파일을 받을 수 없는 환경에서도 답변은 계속 (토큰 수는 근사치)
+        print(f"⚠️ tiktoken 인코딩 로딩 실패, 글자 수로 토큰 수를 근사합니다: {e}")
+        return None
+
+
+def count_tokens(text):
+    encoding = _encoding()
+    if encoding is None:
+        return (len(text) + 1) // 2
+    return len(encoding.encode(text))
+
+
+def _truncate(text, tokens):
+    encoding = _encoding()
+    if encoding is None:
+        return text[:tokens * 2]
+    return encoding.decode(encoding.encode(text)[:tokens])
+
+
+def _overlap(left, right):
+    """left 끝과 right 앞이 겹치는 글자 수 (MIN_OVERLAP 미만이면 0)"""
+    for size in range(min(len(left), len(right), MAX_OVERLAP), MIN_OVERLAP - 1, -1):
+        if left.endswith(right[:size]):
+            return size
+    return 0
+
+
+class _Piece:
+    def __init__(self, text, metadata, rank):
+        self.text = text
+        self.metadata = metadata
+        self.rank = rank
+        self.key = (metadata.get("source"), metadata.get("page"))
+
+
+def _merge_neighbours(pieces):
+    """같은 페이지에서 겹치는 청크끼리 이어 붙임 (겹친 부분은 한 번만)"""
+    merged = []
+    for piece in pieces:
+        for other in merged:
+            if other.key != piece.key:
+                continue
+            if piece.text in other.text:
+                other.rank = min(other.rank, piece.rank)
+                break
+            if other.text in piece.text:
+                other.text = piece.text
+                other.rank = min(other.rank, piece.rank)
+                break
+            size = _overlap(other.text, piece.text)
+            if size:
+                other.text += piece.text[size:]
+                other.rank = min(other.rank, piece.rank)
+                break
+            size = _overlap(piece.text, other.text)
+            if size:
+                other.text = piece.text + other.text[size:]
+                other.rank = min(other.rank, piece.rank)
+                break
+        else:
+            merged.append(piece)
+    return merged
+
+
+def assemble_context(query, docs, budget=CONTEXT_TOKEN_BUDGET):
+    """
+    검색 결과(순위순) → 프롬프트용 문서 내용
+    1. 중복/겹치는 이웃 청크 제거 + 같은 페이지 인접 청크 병합
+    2. 질문 n-gram 포함 비율 + 검색 순위로 재정렬
+    3. 토큰 예산 안에서 점수 순으로 채움 (넘치는 마지막 조각은 잘라서)
+    반환: (문서 내용, 통계)
+    """
+    pieces = _merge_neighbours([_Piece(doc.page_content, doc.metadata or {}, rank) for rank, doc in enumerate(docs)])
+
+    query_grams = set(char_ngrams(query))
+
+    def score(piece):
+        coverage = len(query_grams & set(char_ngrams(piece.text))) / len(query_grams) if query_grams else 0.0
+        return coverage + RANK_WEIGHT / (piece.rank + 1)
+
+    pieces.sort(key=score, reverse=True)
+
+    parts = []
+    used = 0
+    for piece in pieces:
+        tokens = count_tokens(piece.text)
+        remaining = budget - used
+        if tokens > remaining:
+            if remaining >= MIN_TRUNCATED_TOKENS:
+                parts.append(_truncate(piece.text, remaining))
+                used = budget
+            break
+        parts.append(piece.text)
+        used += tokens
+
+    return "\n\n".join(parts), {
+        "retrieved_chunks": len(docs),
+        "context_chunks": len(parts),
+        "context_tokens": used,
+    }
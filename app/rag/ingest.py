@@ -0,0 +1,181 @@
+import os
+import json
+import time
+import hashlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+# 임베딩 요청 1회당 청크 수 / 동시에 보낼 임베딩 요청 수
+EMBED_BATCH_SIZE = int(os.getenv("RAG_EMBED_BATCH_SIZE", "128"))
+EMBED_CONCURRENCY = int(os.getenv("RAG_EMBED_CONCURRENCY", "4"))
+
+# 프로세스 1개가 한 번에 파싱할 PDF 페이지 수
+PAGES_PER_TASK = 8
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def chunk_id(source, text):
+    """청크 ID = (원본 문서, 내용) 해시 → 내용이 같으면 페이지가 밀려도 같은 ID"""
+    return hashlib.sha256(f"{source}\n{text}".encode("utf-8")).hexdigest()
+
+
+def _pdf_page_count(path):
+    import pdfplumber
+
+    with pdfplumber.open(path) as pdf:
+        return len(pdf.pages)
+
+
+def _parse_pdf_pages(path, start, end):
+    """[start, end) 페이지 텍스트 (프로세스 풀에서 실행)"""
+    import pdfplumber
+
+    with pdfplumber.open(path) as pdf:
+        return [(number, pdf.pages[number].extract_text() or "") for number in range(start, end)]
+
+
+def _parse_pdf(path, pool):
+    total = _pdf_page_count(path)
+    tasks = [
+        pool.submit(_parse_pdf_pages, path, start, min(start + PAGES_PER_TASK, total))
+        for start in range(0, total, PAGES_PER_TASK)
+    ]
+    pages = [page for task in tasks for page in task.result()]
+    return [{"page": number, "text": text} for number, text in pages]
+
+
+def _parse_text(path, pool=None):
+    with open(path, encoding="utf-8") as f:
+        return [{"page": 0, "text": f.read()}]
+
+
+PARSERS = {".pdf": _parse_pdf, ".md": _parse_text, ".txt": _parse_text}
+
+
+class PageCache:
+    """파일 해시별 페이지 텍스트 캐시 (내용이 같은 파일은 다시 파싱하지 않음)"""
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def _path(self, sha256):
+        return os.path.join(self.directory, f"{sha256}.json")
+
+    def get(self, sha256):
+        try:
+            with open(self._path(sha256), encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def put(self, sha256, pages):
+        os.makedirs(self.directory, exist_ok=True)
+        tmp = self._path(sha256) + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(pages, f, ensure_ascii=False)
+        os.replace(tmp, self._path(sha256))
+
+
+def load_pages(path, page_cache, pool):
+    """원본 문서 → [{"page", "text"}] (캐시 적중이면 파싱 생략)"""
+    sha256 = file_sha256(path)
+    pages = page_cache.get(sha256)
+    if pages is not None:
+        return pages, True
+    parser = PARSERS.get(os.path.splitext(path)[1].lower())
+    if parser is None:
+        raise ValueError(f"지원하지 않는 문서 형식입니다: {path}")
+    pages = parser(path, pool)
+    page_cache.put(sha256, pages)
+    return pages, False
+
+
+def split_pages(source, pages, splitter):
+    """페이지별 분할 → {청크 ID: (본문, 메타데이터)} (같은 내용이 반복되면 첫 위치만 사용)"""
+    chunks = {}
+    total = len(pages)
+    for page in pages:
+        for text in splitter.split_text(page["text"]):
+            key = chunk_id(source, text)
+            if key not in chunks:
+                chunks[key] = (text, {"source": source, "page": page["page"], "total_pages": total})
+    return chunks
+
+
+def _batches(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def ingest(sources, collection, embedding, splitter, page_cache, prune=True):
+    """
+    원본 문서들을 벡터 DB(Chroma 컬렉션)와 맞춤 (증분)
+    - 새로 생긴/바뀐 청크만 임베딩해서 upsert, 없어진 청크는 삭제
+    - 내용은 같고 페이지 번호만 바뀐 청크는 메타데이터만 갱신 (임베딩 호출 없음)
+    - prune=True면 sources에 없는 문서의 청크도 삭제
+    - 임베딩은 배치 단위로 보내고 배치마다 바로 저장 (중간에 끊겨도 다음 실행에서 이어서)
+    """
+    started = time.perf_counter()
+    existing = collection.get(include=["metadatas"])
+    stored = {}  # source → {id: metadata}
+    for key, metadata in zip(existing["ids"], existing["metadatas"]):
+        stored.setdefault((metadata or {}).get("source"), {})[key] = metadata
+
+    report = {"sources": {}, "embedded": 0, "updated": 0, "deleted": 0}
+    wanted = {}
+    with ProcessPoolExecutor() as pool:
+        for source in sources:
+            if not os.path.exists(source):
+                print(f"⚠️ 문서가 없어 건너뜁니다 (기존 청크 유지): {source}")
+                wanted.update(dict.fromkeys(stored.get(source, {})))
+                continue
+            pages, cached = load_pages(source, page_cache, pool)
+            chunks = split_pages(source, pages, splitter)
+            wanted.update(chunks)
+            report["sources"][source] = {"pages": len(pages), "chunks": len(chunks), "parse_cached": cached}
+            print(f"✅ {source}: {len(pages)}페이지 → {len(chunks)}청크" + (" (파싱 캐시)" if cached else ""))
+
+    current = {key: metadata for by_id in stored.values() for key, metadata in by_id.items()}
+
+    stale = [key for key in current if key not in wanted]
+    if not prune:
+        stale = [key for key in stale if current[key].get("source") in sources]
+    for batch in _batches(stale, 5000):
+        collection.delete(ids=batch)
+    report["deleted"] = len(stale)
+
+    moved = [
+        key for key, chunk in wanted.items()
+        if chunk is not None and key in current and current[key] != chunk[1]
+    ]
+    for batch in _batches(moved, 5000):
+        collection.update(ids=batch, metadatas=[wanted[key][1] for key in batch])
+    report["updated"] = len(moved)
+
+    new = [key for key, chunk in wanted.items() if chunk is not None and key not in current]
+    print(f"✅ 삭제 {len(stale)} / 메타데이터 갱신 {len(moved)} / 새로 임베딩 {len(new)}")
+
+    def embed(batch):
+        return batch, embedding.embed_documents([wanted[key][0] for key in batch])
+
+    with ThreadPoolExecutor(max_workers=EMBED_CONCURRENCY) as threads:
+        tasks = [threads.submit(embed, batch) for batch in _batches(new, EMBED_BATCH_SIZE)]
+        for task in as_completed(tasks):
+            batch, vectors = task.result()
+            collection.upsert(
+                ids=batch,
+                embeddings=vectors,
+                documents=[wanted[key][0] for key in batch],
+                metadatas=[wanted[key][1] for key in batch],
+            )
+            report["embedded"] += len(batch)
+            print(f"  ↳ 임베딩 {report['embedded']}/{len(new)}")
+
+    report["took_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return report
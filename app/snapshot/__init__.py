@@ -0,0 +1 @@
+from .data_registry import registry
\ No newline at end of file
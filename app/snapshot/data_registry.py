@@ -0,0 +1,205 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+
+# 파일 변경 여부(stat)를 다시 확인하기까지의 최소 간격(초)
+DEFAULT_CHECK_INTERVAL = float(os.getenv("DATA_SNAPSHOT_CHECK_INTERVAL", "2.0"))
+
+
+def load_json_bytes(raw: bytes):
+    return json.loads(raw)
+
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """로딩이 끝난 데이터셋 1개 (value는 읽기 전용으로만 사용)"""
+    name: str
+    value: Any
+    path: str
+    version: int
+    sha256: str
+    size_bytes: int
+    mtime: float
+    loaded_at: float
+    load_ms: float
+
+
+class _Dataset:
+    def __init__(self, name, path, parse, parse_path, build, check_interval):
+        self.name = name
+        self.path = path
+        self.parse = parse
+        self.parse_path = parse_path
+        self.build = build
+        self.check_interval = check_interval
+        self.snapshot: Optional[Snapshot] = None
+        self.stat_key = None
+        self.checked_at = 0.0
+        self.reload_count = 0
+        self.last_error: Optional[str] = None
+        self.lock = threading.Lock()
+
+
+class DataRegistry:
+    """
+    app/data JSON 파일 공용 스냅샷 레지스트리
+    - 데이터셋마다 1회 로딩 + 후처리(build) 결과를 보관
+    - 파일 mtime/크기가 바뀌면 해시를 비교해 내용이 바뀐 경우에만 재로딩 후 통째로 교체
+    - 읽는 쪽은 락 없이 현재 스냅샷 참조만 가져감
+    """
+
+    def __init__(self, data_dir: str = DATA_DIR, check_interval: float = DEFAULT_CHECK_INTERVAL):
+        self.data_dir = data_dir
+        self.check_interval = check_interval
+        self._datasets = {}
+
+    def register(
+        self,
+        name: str,
+        filename: str,
+        build: Optional[Callable[[Any], Any]] = None,
+        parse: Callable[[bytes], Any] = load_json_bytes,
+        parse_path: Optional[Callable[[str], Any]] = None,
+        check_interval: Optional[float] = None,
+    ):
+        """
+        데이터셋 등록 (이미 등록된 이름이면 무시)
+        - parse: 파일 내용(bytes) → 값
+        - parse_path: 지정하면 파일을 통째로 읽지 않고 경로를 넘김 (mmap 로딩용)
+        - build: parse 결과 후처리
+        """
+        if name in self._datasets:
+            return
+        path = filename if os.path.isabs(filename) else os.path.join(self.data_dir, filename)
+        interval = self.check_interval if check_interval is None else check_interval
+        self._datasets[name] = _Dataset(name, path, parse, parse_path, build, interval)
+
+    def path(self, name: str) -> str:
+        """데이터셋 파일 경로"""
+        return self._datasets[name].path
+
+    def exists(self, name: str) -> bool:
+        """데이터셋 파일이 있거나 이미 로딩된 스냅샷이 있는지"""
+        dataset = self._datasets[name]
+        return dataset.snapshot is not None or os.path.exists(dataset.path)
+
+    def get(self, name: str) -> Snapshot:
+        """현재 스냅샷 반환 (파일이 없고 이전 스냅샷도 없으면 FileNotFoundError)"""
+        dataset = self._datasets[name]
+        snapshot = dataset.snapshot
+        if snapshot is not None and time.monotonic() - dataset.checked_at < dataset.check_interval:
+            return snapshot
+        return self._refresh(dataset)
+
+    def value(self, name: str):
+        return self.get(name).value
+
+    def reload(self, name: str) -> Snapshot:
+        """stat 확인 간격과 관계없이 즉시 변경 여부 확인"""
+        dataset = self._datasets[name]
+        dataset.checked_at = 0.0
+        return self._refresh(dataset)
+
+    def _refresh(self, dataset: _Dataset) -> Snapshot:
+        with dataset.lock:
+            # 락을 기다리는 동안 다른 스레드가 이미 확인했을 수 있음
+            if dataset.snapshot is not None and time.monotonic() - dataset.checked_at < dataset.check_interval:
+                return dataset.snapshot
+
+            try:
+                stat = os.stat(dataset.path)
+            except FileNotFoundError:
+                dataset.checked_at = time.monotonic()
+                if dataset.snapshot is not None:
+                    return dataset.snapshot
+                raise
+
+            stat_key = (stat.st_mtime_ns, stat.st_size)
+            if dataset.snapshot is not None and stat_key == dataset.stat_key:
+                dataset.checked_at = time.monotonic()
+                return dataset.snapshot
+
+            try:
+                snapshot = self._load(dataset, stat)
+            except Exception as e:
+                dataset.last_error = str(e)
+                dataset.checked_at = time.monotonic()
+                if dataset.snapshot is not None:
+                    print(f"⚠️ 데이터 재로딩 실패 ({dataset.name}), 이전 스냅샷 유지: {e}")
+                    return dataset.snapshot
+                raise
+
+            dataset.stat_key = stat_key
+            dataset.checked_at = time.monotonic()
+            dataset.last_error = None
+            if snapshot is not dataset.snapshot:
+                dataset.snapshot = snapshot
+                dataset.reload_count += 1
+            return dataset.snapshot
+
+    def _load(self, dataset: _Dataset, stat) -> Snapshot:
+        started = time.perf_counter()
+        if dataset.parse_path is not None:
+            raw = None
+            digest = _file_sha256(dataset.path)
+        else:
+            with open(dataset.path, "rb") as f:
+                raw = f.read()
+            digest = hashlib.sha256(raw).hexdigest()
+
+        # mtime만 바뀌고 내용은 같으면 기존 스냅샷 재사용
+        if dataset.snapshot is not None and dataset.snapshot.sha256 == digest:
+            return dataset.snapshot
+
+        value = dataset.parse_path(dataset.path) if raw is None else dataset.parse(raw)
+        if dataset.build is not None:
+            value = dataset.build(value)
+
+        previous = dataset.snapshot
+        return Snapshot(
+            name=dataset.name,
+            value=value,
+            path=os.path.abspath(dataset.path),
+            version=previous.version + 1 if previous else 1,
+            sha256=digest,
+            size_bytes=stat.st_size,
+            mtime=stat.st_mtime,
+            loaded_at=time.time(),
+            load_ms=round((time.perf_counter() - started) * 1000, 2),
+        )
+
+    def metrics(self):
+        result = []
+        for dataset in self._datasets.values():
+            snapshot = dataset.snapshot
+            result.append({
+                "name": dataset.name,
+                "path": os.path.abspath(dataset.path),
+                "loaded": snapshot is not None,
+                "version": snapshot.version if snapshot else None,
+                "sha256": snapshot.sha256 if snapshot else None,
+                "size_bytes": snapshot.size_bytes if snapshot else None,
+                "mtime": snapshot.mtime if snapshot else None,
+                "loaded_at": snapshot.loaded_at if snapshot else None,
+                "load_ms": snapshot.load_ms if snapshot else None,
+                "reload_count": dataset.reload_count,
+                "last_error": dataset.last_error,
+            })
+        return result
+
+
+registry = DataRegistry()
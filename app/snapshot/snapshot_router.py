@@ -0,0 +1,24 @@
+from fastapi import APIRouter, HTTPException, Depends
+from app.snapshot.data_registry import registry
+from app.domain.user.user_router import get_current_user
+
+router = APIRouter(prefix="/api/snapshots", tags=["Snapshot"])
+
+
+@router.get("")
+def get_snapshot_metrics():
+    """데이터셋별 로딩 시각, 소요 시간, 크기 등"""
+    return {"snapshots": registry.metrics()}
+
+
+@router.post("/{name}/reload")
+def reload_snapshot(name: str, current_user=Depends(get_current_user)):
+    try:
+        snapshot = registry.reload(name)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="등록되지 않은 데이터셋입니다.")
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="데이터 파일이 없습니다.")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"데이터 로딩 실패: {str(e)}")
+    return {"name": snapshot.name, "version": snapshot.version, "load_ms": snapshot.load_ms}
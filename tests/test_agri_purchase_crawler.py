@@ -0,0 +1,103 @@
+import random
+import asyncio
+import httpx
+import pytest
+
+from app.domain.agriPurchase.generate_full_data_json import AgriPurchaseCrawler, CrawlError
+
+BASE_URL = "http://fake.nongsaro/selectAgriPriceInfoLst"
+TOTAL_COUNT = 9
+NUM_OF_ROWS = 2
+TOTAL_PAGES = 5
+
+
+def _item(no):
+    return {"sj": f"트랙터 {no}", "price": str(no * 1000)}
+
+
+def _page_xml(page_no):
+    start = (page_no - 1) * NUM_OF_ROWS + 1
+    end = min(start + NUM_OF_ROWS, TOTAL_COUNT + 1)
+    items = "".join(
+        "<item>" + "".join(f"<{k}>{v}</{k}>" for k, v in _item(no).items()) + "</item>"
+        for no in range(start, end)
+    )
+    return (
+        "<response><header><resultCode>00</resultCode></header>"
+        f"<body><items>{items}</items><totalCount>{TOTAL_COUNT}</totalCount></body></response>"
+    ).encode("utf-8")
+
+
+class FlakyServer:
+    """무작위 503 / 잘린 XML을 섞어 주는 가짜 농사로 API (down 페이지는 항상 503)"""
+
+    def __init__(self, seed, down=()):
+        self.random = random.Random(seed)
+        self.down = set(down)
+        self.requested = []
+        self.failures = {}
+
+    def __call__(self, request):
+        page_no = int(request.url.params["pageNo"])
+        self.requested.append(page_no)
+        if page_no in self.down:
+            return httpx.Response(503)
+        # 페이지당 연속 실패는 2번까지 (max_attempts 안에서 반드시 성공)
+        if self.failures.get(page_no, 0) < 2 and self.random.random() < 0.5:
+            self.failures[page_no] = self.failures.get(page_no, 0) + 1
+            if self.random.random() < 0.5:
+                return httpx.Response(503)
+            return httpx.Response(200, content=_page_xml(page_no)[:40])
+        self.failures[page_no] = 0
+        return httpx.Response(200, content=_page_xml(page_no))
+
+
+def _crawler(server, checkpoint_dir):
+    return AgriPurchaseCrawler(
+        base_url=BASE_URL,
+        api_key="test",
+        concurrency=3,
+        checkpoint_dir=str(checkpoint_dir),
+        num_of_rows=NUM_OF_ROWS,
+        max_attempts=4,
+        backoff=0,
+        transport=httpx.MockTransport(server),
+    )
+
+
+def test_crawl_retries_flaky_pages(tmp_path):
+    server = FlakyServer(seed=1)
+    items = asyncio.run(_crawler(server, tmp_path / "ckpt").crawl())
+
+    assert items == [_item(no) for no in range(1, TOTAL_COUNT + 1)]
+    assert len(server.requested) > TOTAL_PAGES
+
+
+def test_interrupted_crawl_resumes_from_checkpoint(tmp_path):
+    checkpoint_dir = tmp_path / "ckpt"
+
+    first = FlakyServer(seed=2, down={4})
+    with pytest.raises(CrawlError):
+        asyncio.run(_crawler(first, checkpoint_dir).crawl())
+    saved = sorted(p.name for p in checkpoint_dir.glob("page_*.json"))
+    assert saved == [f"page_{n:05d}.json" for n in (1, 2, 3, 5)]
+
+    second = FlakyServer(seed=3)
+    items = asyncio.run(_crawler(second, checkpoint_dir).crawl())
+
+    # 1페이지(totalCount 확인)와 실패했던 4페이지만 다시 요청
+    assert set(second.requested) == {1, 4}
+    assert items == [_item(no) for no in range(1, TOTAL_COUNT + 1)]
+
+
+def test_checkpoint_discarded_when_total_count_changes(tmp_path):
+    checkpoint_dir = tmp_path / "ckpt"
+    checkpoint_dir.mkdir()
+    (checkpoint_dir / "meta.json").write_text('{"totalCount": 1}', encoding="utf-8")
+    (checkpoint_dir / "page_00002.json").write_text('[{"sj": "stale"}]', encoding="utf-8")
+
+    server = FlakyServer(seed=4)
+    items = asyncio.run(_crawler(server, checkpoint_dir).crawl())
+
+    assert set(server.requested) == set(range(1, TOTAL_PAGES + 1))
+    assert items == [_item(no) for no in range(1, TOTAL_COUNT + 1)]